@@ -14,7 +14,7 @@ from .config import (
     parse_proxy,
 )
 from .prompts import Prompt, match_prompt
-from .stats import stats as global_stats
+from .stats import get_stats
 from .telegram_utils import (
     add_topic_from_folders,
     find_word,
@@ -38,7 +38,7 @@ instances: List[Instance] = []
 langfuse = None
 
 # Use shared stats tracker
-stats = global_stats
+stats = get_stats()
 
 NEGATIVE_REACTIONS = {"👎"}  # thumbs down
 POSITIVE_REACTIONS = {"👍"}  # thumbs up
@@ -100,6 +100,7 @@ async def rescan_loop(instance: Instance, interval: int = 3600) -> None:
         await asyncio.sleep(interval)
         config = load_config()
         prompts.config.update(config)
+        prompts._bind_config()
         await update_instance_chat_ids(instance, False)
 
 
@@ -304,6 +305,7 @@ async def main() -> None:
     global client, instances, config
     config = load_config()
     prompts.config.update(config)
+    prompts._bind_config()
     global langfuse
     langfuse = langfuse_utils.init_langfuse(config)
     prompts.langfuse = langfuse
@@ -318,6 +320,7 @@ async def main() -> None:
     await client.start()
 
     prompts.stats = stats
+    stats.start_flusher()
 
     instances = await load_instances(config)
     await prompts.load_langfuse_prompts(instances)
@@ -1,8 +1,18 @@
 import asyncio
+import base64
+import hashlib
+import json
 import logging
 from dataclasses import dataclass
 
 import httpx
+import tenacity
+from openai import APIStatusError, RateLimitError
+
+try:  # pragma: no cover - private SDK helper, may move between versions
+    from openai.lib._pydantic import to_strict_json_schema
+except Exception:  # pragma: no cover
+    to_strict_json_schema = None
 
 try:
     from langfuse import observe  # type: ignore
@@ -33,6 +43,40 @@ logger = logging.getLogger(__name__)
 config: dict = {}
 stats: StatsTracker | None = None
 
+# Hot-path copies of config values, populated by _bind_config()
+_MODEL: str = "gpt-4.1-mini"
+_API_KEY: str | None = None
+_PROXY: str | None = None
+_bound = False
+
+
+def _bind_config() -> None:
+    """Cache hot config values in module globals for the per-message path."""
+    global _MODEL, _API_KEY, _PROXY, _bound
+    _MODEL = config.get("openai_model", "gpt-4.1-mini")
+    _API_KEY = config.get("openai_api_key")
+    _PROXY = config.get("proxy_url")
+    _bound = True
+
+
+_openai_client = None
+_openai_client_key: tuple | None = None
+
+
+def _get_client(api_key: str, proxy: str | None):
+    """Return a process-wide OpenAI client, rebuilt only when config changes.
+
+    Reusing one client keeps the underlying httpx connection pool (and TLS
+    sessions) alive across calls instead of paying setup cost per message.
+    """
+    global _openai_client, _openai_client_key
+    key = (api_key, proxy, openai.AsyncOpenAI)
+    if _openai_client is None or _openai_client_key != key:
+        http_client = httpx.AsyncClient(proxy=proxy) if proxy else None
+        _openai_client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client)
+        _openai_client_key = key
+    return _openai_client
+
 
 @dataclass
 class Prompt:
@@ -52,6 +96,11 @@ def build_prompt(prompt: Prompt) -> str:
     """Construct final system prompt for LLM evaluation."""
     compiled = f"{prompt.prompt}"
     prompt._compiled_prompt = compiled
+    prompt._system_msg = {"role": "system", "content": compiled}
+    prompt._extra = getattr(getattr(prompt, "_lf_prompt", None), "config", None) or {}
+    # Stable digest of the compiled text for downstream cache keys
+    prompt._compiled_sha = hashlib.sha256(compiled.encode()).digest()
+    prompt._compiled_b64 = base64.b64encode(prompt._compiled_sha).decode()
     return compiled
 
 
@@ -114,6 +163,37 @@ async def load_langfuse_prompt(prompt: Prompt):
     return lf_prompt
 
 
+def _retry_after_seconds(exc: Exception) -> float | None:
+    """Return server-suggested pause from ``Retry-After`` header, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+@tenacity.retry(
+    stop=tenacity.stop_after_attempt(5),
+    wait=tenacity.wait_random_exponential(min=1, max=30),
+    retry=tenacity.retry_if_exception_type((RateLimitError, APIStatusError)),
+    reraise=True,
+)
+async def _call_openai(client, params: dict):
+    """Call the completions API, pacing retries by ``Retry-After`` on 429/5xx."""
+    try:
+        return await client.chat.completions.create(**params)
+    except (RateLimitError, APIStatusError) as exc:
+        retry_after = _retry_after_seconds(exc)
+        if retry_after is not None:
+            await asyncio.sleep(retry_after)
+        raise
+
+
 class EvaluateResult(BaseModel):
     """Result returned by LLM evaluation."""
 
@@ -130,10 +210,49 @@ class EvaluateResult(BaseModel):
     score: Annotated[int, Field(ge=0, le=5, description="Уровень")] = 0
 
 
+class EvaluateResultList(BaseModel):
+    """Batched results, one :class:`EvaluateResult` per input item, in order."""
+
+    results: list[EvaluateResult] = []
+
+
 class MatchPromptResult(EvaluateResult):
     trace_id: str | None = None
 
 
+def _schema_envelope(model_cls) -> dict:
+    """Build the ``response_format`` envelope for ``model_cls`` once.
+
+    Passing the precompiled dict to ``create`` avoids the per-call schema
+    derivation the SDK performs when it is handed a pydantic class.
+    """
+    if to_strict_json_schema is not None:
+        schema = to_strict_json_schema(model_cls)
+        strict = True
+    else:
+        schema = model_cls.model_json_schema()
+        strict = False
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model_cls.__name__,
+            "strict": strict,
+            "schema": schema,
+        },
+    }
+
+
+_EVAL_SCHEMA = _schema_envelope(EvaluateResult)
+_EVAL_LIST_SCHEMA = _schema_envelope(EvaluateResultList)
+
+
+_BATCH_SUFFIX = (
+    '\n\nYou will receive a JSON object {"items": [{"id": ..., "text": ...}]}. '
+    "Evaluate each item independently and return one result per item, "
+    "in the same order as the ids."
+)
+
+
 @observe()
 async def match_prompt(
     prompt: Prompt,
@@ -142,31 +261,28 @@ async def match_prompt(
     chat_name: str | None = None,
 ) -> MatchPromptResult:
     """Return :class:`EvaluateResult` for ``text`` using OpenAI."""
-    if not prompt.prompt or not config.get("openai_api_key"):
+    api_key = _API_KEY if _bound else config.get("openai_api_key")
+    if not prompt.prompt or not api_key:
         return MatchPromptResult(score=0, reasoning="", quote="", trace_id=None)
 
-    proxy = config.get("proxy_url")
-    http_client = httpx.Client(proxy=proxy) if proxy else None
-    client = openai.OpenAI(api_key=config["openai_api_key"], http_client=http_client)
-    model = config.get("openai_model", "gpt-4.1-mini")
+    proxy = _PROXY if _bound else config.get("proxy_url")
+    client = _get_client(api_key, proxy)
+    model = _MODEL if _bound else config.get("openai_model", "gpt-4.1-mini")
 
     if not getattr(prompt, "_compiled_prompt", None):
         build_prompt(prompt)
 
-    messages = [
-        {"role": "system", "content": prompt._compiled_prompt},
-        {"role": "user", "content": text},
-    ]
+    messages = [prompt._system_msg, {"role": "user", "content": text}]
     try:
         metadata = {}
         tags = [t for t in [inst_name, chat_name] if t]
         if tags:
             metadata["langfuse_tags"] = tags
-        extra = getattr(getattr(prompt, "_lf_prompt", None), "config", None) or {}
+        extra = getattr(prompt, "_extra", None) or {}
         params = {
             "model": extra.get("model", model),
             "messages": messages,
-            "response_format": EvaluateResult,
+            "response_format": _EVAL_SCHEMA,
             "metadata": metadata or None,
         }
         if "temperature" in extra:
@@ -176,11 +292,10 @@ async def match_prompt(
         if langfuse is not None:
             params["langfuse_prompt"] = getattr(prompt, "_lf_prompt", None)
 
-        completion = await asyncio.to_thread(
-            client.chat.completions.parse,
-            **params,
+        completion = await _call_openai(client, params)
+        result = EvaluateResult.model_validate_json(
+            completion.choices[0].message.content
         )
-        result = completion.choices[0].message.parsed
         usage = getattr(completion, "usage", None)
         if inst_name and stats is not None and usage is not None:
             stats.add_tokens(
@@ -219,6 +334,100 @@ async def match_prompt(
     return match_prompt_result
 
 
+@observe()
+async def match_prompt_batch(
+    prompt: Prompt,
+    texts: list[str],
+    inst_name: str | None = None,
+    chat_name: str | None = None,
+) -> list[MatchPromptResult]:
+    """Score ``texts`` with one OpenAI call, amortizing the prompt prefix.
+
+    Returns one :class:`MatchPromptResult` per input text, in order. Missing
+    results (model returned fewer items) are padded with score=0.
+    """
+    if not texts:
+        return []
+
+    def empty() -> MatchPromptResult:
+        return MatchPromptResult(score=0, reasoning="", quote="", trace_id=None)
+
+    api_key = _API_KEY if _bound else config.get("openai_api_key")
+    if not prompt.prompt or not api_key:
+        return [empty() for _ in texts]
+
+    proxy = _PROXY if _bound else config.get("proxy_url")
+    client = _get_client(api_key, proxy)
+    model = _MODEL if _bound else config.get("openai_model", "gpt-4.1-mini")
+
+    if not getattr(prompt, "_compiled_prompt", None):
+        build_prompt(prompt)
+
+    items = {"items": [{"id": i, "text": t} for i, t in enumerate(texts)]}
+    messages = [
+        {"role": "system", "content": prompt._compiled_prompt + _BATCH_SUFFIX},
+        {"role": "user", "content": json.dumps(items, ensure_ascii=False)},
+    ]
+    try:
+        metadata = {}
+        tags = [t for t in [inst_name, chat_name] if t]
+        if tags:
+            metadata["langfuse_tags"] = tags
+        extra = getattr(prompt, "_extra", None) or {}
+        params = {
+            "model": extra.get("model", model),
+            "messages": messages,
+            "response_format": _EVAL_LIST_SCHEMA,
+            "metadata": metadata or None,
+        }
+        if "temperature" in extra:
+            params["temperature"] = extra["temperature"]
+        if "top_p" in extra:
+            params["top_p"] = extra["top_p"]
+        if langfuse is not None:
+            params["langfuse_prompt"] = getattr(prompt, "_lf_prompt", None)
+
+        completion = await _call_openai(client, params)
+        parsed = EvaluateResultList.model_validate_json(
+            completion.choices[0].message.content
+        )
+        results = list(parsed.results)
+        usage = getattr(completion, "usage", None)
+        if inst_name and stats is not None and usage is not None:
+            stats.add_tokens(
+                inst_name,
+                getattr(usage, "prompt_tokens", 0) or 0,
+                getattr(usage, "completion_tokens", 0) or 0,
+                total_tokens=getattr(usage, "total_tokens", None),
+            )
+    except Exception as exc:  # pragma: no cover - external call
+        logger.error("Failed to query OpenAI: %s", exc)
+        return [empty() for _ in texts]
+
+    trace_id = None
+    if langfuse is not None:
+        try:
+            trace_id = langfuse.get_current_trace_id()
+        except Exception as exc:  # pragma: no cover - optional external call
+            logger.error("Failed to log Langfuse trace: %s", exc)
+
+    out: list[MatchPromptResult] = []
+    for i in range(len(texts)):
+        if i < len(results):
+            r = results[i]
+            out.append(
+                MatchPromptResult(
+                    score=r.score,
+                    reasoning=r.reasoning,
+                    quote=r.quote,
+                    trace_id=trace_id,
+                )
+            )
+        else:
+            out.append(empty())
+    return out
+
+
 async def load_langfuse_prompts(instances: list["Instance"]) -> None:
     """Load prompt texts from Langfuse for all provided instances."""
     for inst in instances:
@@ -1,20 +1,40 @@
 import argparse
 import asyncio
-import json
 import os
 
+import orjson
+
 from . import langfuse_utils, prompts
 from .config import load_config, load_instances
 from .evals import get_eval_path
 
-try:  # pragma: no cover - optional dependency
-    from deepeval import evaluate
-    from deepeval.metrics.base_metric import BaseMetric
-    from deepeval.test_case import LLMTestCase
-except Exception:  # pragma: no cover - optional dependency
-    evaluate = None
-    LLMTestCase = object  # type: ignore
-    BaseMetric = object  # type: ignore
+# deepeval is heavy to import (seconds); load it lazily so `--help` and
+# config-error paths stay fast. Populated by _import_deepeval().
+evaluate = None
+LLMTestCase = object  # type: ignore
+BaseMetric = object  # type: ignore
+_deepeval_import_attempted = False
+
+
+def _import_deepeval() -> None:
+    """Populate module-level deepeval names on first real use."""
+    global evaluate, LLMTestCase, BaseMetric, _deepeval_import_attempted
+    if evaluate is not None or _deepeval_import_attempted:
+        return
+    _deepeval_import_attempted = True
+    try:  # pragma: no cover - optional dependency
+        from deepeval import evaluate as evaluate_fn
+        from deepeval.metrics.base_metric import BaseMetric as base_metric_cls
+        from deepeval.test_case import LLMTestCase as test_case_cls
+    except Exception:  # pragma: no cover - optional dependency
+        return
+    evaluate = evaluate_fn
+    LLMTestCase = test_case_cls
+    BaseMetric = base_metric_cls
+
+
+# Rows scored per OpenAI request; one request amortizes the system prompt
+BATCH_SIZE = 10
 
 
 async def run_prompt_match(prompt, text: str):
@@ -22,6 +42,37 @@ async def run_prompt_match(prompt, text: str):
     return await prompts.match_prompt(prompt, text)
 
 
+async def run_prompt_match_batch(prompt, texts: list[str]):
+    """Run batched prompt match and return raw results, one per text."""
+    return await prompts.match_prompt_batch(prompt, texts)
+
+
+def build_test_cases(rows: list[dict], results: list, threshold: int) -> list:
+    """Construct :class:`LLMTestCase` objects for scored dataset rows.
+
+    Once scoring is out of the way this loop dominates replay time, so the
+    body sticks to local bindings and a pre-bound ``append``.
+    """
+    tc_cls = LLMTestCase
+    test_cases: list = []
+    append = test_cases.append
+    for row, res in zip(rows, results):
+        expected_bool = bool(row["expected"]["is_match"])
+        tc = tc_cls(
+            input=row["input"],
+            actual_output=("true" if res.score >= threshold else "false"),
+            expected_output="true" if expected_bool else "false",
+            comments=res.reasoning or None,
+            context=[res.quote] if res.quote else None,
+            token_cost=getattr(res, "token_cost", None),
+            completion_time=getattr(res, "completion_time", None),
+        )
+        # Precomputed verdict so measure() skips string comparisons per case
+        tc._expected_bool = expected_bool
+        append(tc)
+    return test_cases
+
+
 async def run_deepeval(
     instance: str,
     prompt_name: str,
@@ -41,6 +92,7 @@ async def run_deepeval(
 
     config = load_config()
     prompts.config.update(config)
+    prompts._bind_config()
     global langfuse
     langfuse = langfuse_utils.init_langfuse(config)
     prompts.langfuse = langfuse
@@ -54,27 +106,23 @@ async def run_deepeval(
     if prompt is None:
         raise ValueError(f"Prompt '{prompt_name}' not found in instance '{instance}'")
 
+    _import_deepeval()
+
     base = get_eval_path(inst.name, prompt.name or "prompt", suffix)
     msg_path = base / "messages.jsonl"
     if not msg_path.exists():
         raise FileNotFoundError(msg_path)
 
-    test_cases = []
-    for line in msg_path.read_text(encoding="utf-8").splitlines():
-        row = json.loads(line)
-
-        res = await run_prompt_match(prompt, row["input"])
-        test_cases.append(
-            LLMTestCase(
-                input=row["input"],
-                actual_output=("true" if res.score >= prompt.threshold else "false"),
-                expected_output=str(row["expected"]["is_match"]).lower(),
-                comments=res.reasoning or None,
-                context=[res.quote] if res.quote else None,
-                token_cost=getattr(res, "token_cost", None),
-                completion_time=getattr(res, "completion_time", None),
-            )
+    # One bytes read + orjson decode per line; no intermediate str rows
+    rows = [orjson.loads(line) for line in msg_path.read_bytes().splitlines() if line]
+
+    results: list = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start : start + BATCH_SIZE]
+        results.extend(
+            await run_prompt_match_batch(prompt, [r["input"] for r in batch])
         )
+    test_cases = build_test_cases(rows, results, prompt.threshold)
 
     class BoolAccuracyMetric(BaseMetric):
         """Проверяет, совпадает ли булев verdict модели с эталоном."""
@@ -95,9 +143,11 @@ async def run_deepeval(
             try:
                 # actual_output is now a string "true"/"false"
                 actual_bool = test_case.actual_output == "true"
-                expected_bool = test_case.expected_output == "true"
+                expected_bool = getattr(test_case, "_expected_bool", None)
+                if expected_bool is None:
+                    expected_bool = test_case.expected_output == "true"
 
-                self.score = 1.0 if actual_bool == expected_bool else 0.0
+                self.score = float(actual_bool == expected_bool)
                 self.reason = (
                     "match" if self.score else f"exp={expected_bool}, got={actual_bool}"
                 )
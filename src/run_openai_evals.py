@@ -1,9 +1,11 @@
 import argparse
 import asyncio
-import json
 import os
+from functools import cache
 
-from openai import OpenAI
+import httpx
+import tenacity
+from openai import AsyncOpenAI
 
 from .config import load_config, load_instances
 from .evals import get_eval_path
@@ -11,7 +13,23 @@ from .prompts import EvaluateResult
 from .telegram_utils import get_safe_name
 
 
-def run_openai_evals(
+@cache
+def _eval_schema() -> dict:
+    """Pydantic schema generation is slow; build it once per process."""
+    return EvaluateResult.model_json_schema()
+
+
+@tenacity.retry(
+    stop=tenacity.stop_after_attempt(3),
+    wait=tenacity.wait_exponential(min=1, max=10),
+    reraise=True,
+)
+async def _call(fn, *args, **kwargs):
+    """Run one OpenAI SDK call with exponential-backoff retry."""
+    return await fn(*args, **kwargs)
+
+
+async def run_openai_evals(
     instance: str,
     prompt_name: str,
     suffix: str,
@@ -29,7 +47,7 @@ def run_openai_evals(
         config_module.CONFIG_PATH = config_path
 
     config = load_config()
-    instances = asyncio.run(load_instances(config))
+    instances = await load_instances(config)
 
     inst = next((i for i in instances if i.name == instance), None)
     if inst is None:
@@ -39,7 +57,14 @@ def run_openai_evals(
     if prompt is None:
         raise ValueError(f"Prompt '{prompt_name}' not found in instance '{instance}'")
 
-    client = OpenAI(api_key=config.get("openai_api_key"))
+    # Shared keepalive transport so the sequential API calls reuse one TLS
+    # connection instead of paying a handshake each.
+    client = AsyncOpenAI(
+        api_key=config.get("openai_api_key"),
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20)
+        ),
+    )
 
     eval_name = f"{get_safe_name(inst.name)}_{get_safe_name(prompt.name or 'prompt')}"
 
@@ -85,7 +110,8 @@ def grade(sample, item):
         }
     ]
 
-    eval_obj = client.evals.create(
+    eval_obj = await _call(
+        client.evals.create,
         name=eval_name,
         data_source_config={
             "type": "custom",
@@ -100,10 +126,11 @@ def grade(sample, item):
     data_path = base / "messages.jsonl"
     if not data_path.exists():
         raise FileNotFoundError(data_path)
-    # with data_path.open("rb") as fh:
-    #     uploaded = client.files.create(file=fh, purpose="evals")
-    with data_path.open("rb") as fh:
-        rows = [json.loads(line) for line in fh]
+    # Read off the event loop, then stream the dataset up once
+    data = await asyncio.to_thread(data_path.read_bytes)
+    uploaded = await _call(
+        client.files.create, file=(data_path.name, data), purpose="evals"
+    )
 
     model = (prompt.config or {}).get("model", "gpt-4.1")
     temperature = (prompt.config or {}).get("temperature", 1)
@@ -113,7 +140,7 @@ def grade(sample, item):
             "type": "json_schema",
             "json_schema": {
                 "name": "EvaluateResult",
-                "schema": EvaluateResult.model_json_schema(),
+                "schema": _eval_schema(),
             },
         },
         "temperature": temperature,
@@ -130,11 +157,7 @@ def grade(sample, item):
             ],
         },
         "sampling_params": sampling_params,
-        # "source": {"type": "file_id", "id": uploaded.id},
-        "source": {
-            "type": "file_content",
-            "content": [{"item": row} for row in rows],
-        },
+        "source": {"type": "file_id", "id": uploaded.id},
     }
 
     run_name_parts = [
@@ -142,7 +165,8 @@ def grade(sample, item):
         f"temp {temperature}",
     ]
 
-    run = client.evals.runs.create(
+    run = await _call(
+        client.evals.runs.create,
         eval_obj.id,
         name=", ".join(run_name_parts),
         data_source=data_source,
@@ -158,8 +182,10 @@ def main() -> None:
     parser.add_argument("--prompt", required=True, help="Prompt name")
     parser.add_argument("--suffix", required=True, help="Dataset suffix")
     args = parser.parse_args()
-    url = run_openai_evals(
-        args.instance, args.prompt, args.suffix, config_path=args.config
+    url = asyncio.run(
+        run_openai_evals(
+            args.instance, args.prompt, args.suffix, config_path=args.config
+        )
     )
     if url:
         print(f"Report URL: {url}")
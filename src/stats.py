@@ -1,24 +1,44 @@
+import asyncio
 import atexit
-import datetime
-import json
 import logging
 import os
 import time
-from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+import msgspec
 
 logger = logging.getLogger(__name__)
 
 STATS_PATH = os.path.join("data", "stats.json")
 
+# Journal flushes between full-file compactions
+SNAPSHOT_EVERY = 50
+
+
+# Formatting the UTC day on every message is measurable in the hot path;
+# cache it and recompute at most once a minute.
+_DAY_CACHE = {"ts": 0.0, "day": ""}
+
 
 def current_day() -> str:
     """Return the current day string in UTC."""
-    return datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%d")
+    now = time.time()
+    if now - _DAY_CACHE["ts"] < 60:
+        return _DAY_CACHE["day"]
+    _DAY_CACHE["day"] = time.strftime("%Y-%m-%d", time.gmtime(now))
+    _DAY_CACHE["ts"] = now
+    return _DAY_CACHE["day"]
+
 
+class Stats(msgspec.Struct):
+    """Statistics counters for processed messages.
 
-@dataclass
-class Stats:
-    """Statistics counters for processed messages."""
+    Kept as a msgspec Struct so the per-message bump is an attribute
+    store instead of a dict hash + lookup, and serialization encodes the
+    attributes to bytes in one C pass with no intermediate dict;
+    dict-style access is supported for code that treats a scope like its
+    serialized form.
+    """
 
     total: int = 0
     forwarded_total: int = 0
@@ -28,6 +48,12 @@ class Stats:
     input_tokens: int = 0
     output_tokens: int = 0
 
+    def __getitem__(self, key: str) -> int:
+        return getattr(self, key)
+
+    def get(self, key: str, default: int = 0) -> int:
+        return getattr(self, key, default)
+
     @classmethod
     def from_dict(cls, data: dict | None) -> "Stats":
         data = data or {}
@@ -42,7 +68,7 @@ class Stats:
         )
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return msgspec.structs.asdict(self)
 
 
 def convert(data: dict) -> dict:
@@ -84,38 +110,130 @@ class StatsTracker:
 
     def __init__(self, path: str, flush_interval: int = 60) -> None:
         self.path = path
+        self.journal_path = path + ".log"
+        # Create the data dir once instead of per flush
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
         self.flush_interval = flush_interval
         self.last_flush = time.monotonic()
         self.dirty = False
-        self.data = {"stats": Stats().to_dict(), "instances": []}
+        self._flusher_task: asyncio.Task | None = None
+        self._pending: list[dict] = []
+        # Coalesced per-(name, day, flags) counter deltas; merging here means
+        # the journal carries one op per unique key instead of one per message
+        self._pending_inc: dict[tuple, dict] = {}
+        self._pending_tok: dict[tuple, dict] = {}
+        self._journal_flushes = 0
+        self.data = {"stats": Stats(), "instances": []}
         if os.path.exists(path):
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
+                with open(path, "rb") as f:
+                    self.data = msgspec.json.decode(f.read())
                 if "stats" not in self.data:
                     self.data = convert(self.data)
+                self._hydrate()
             except Exception:  # pragma: no cover - corrupt file
-                self.data = {"stats": Stats().to_dict(), "instances": []}
+                self.data = {"stats": Stats(), "instances": []}
+        # Name -> instance dict index so the per-message path avoids O(N) scans
+        self._by_name: dict[str, dict] = {
+            inst.get("name"): inst for inst in self.data.get("instances", [])
+        }
+        self._replay_journal()
 
-    def _get_inst(self, name: str) -> dict:
+    def _hydrate(self) -> None:
+        """Turn loaded counter dicts into ``Stats`` objects."""
+        self.data["stats"] = Stats.from_dict(self.data.get("stats"))
         for inst in self.data.get("instances", []):
-            if inst.get("name") == name:
-                inst.setdefault("stats", Stats().to_dict())
-                inst.setdefault("tokens", 0)
-                inst.setdefault("input_tokens", 0)
-                inst.setdefault("output_tokens", 0)
-                return inst
+            if not isinstance(inst.get("stats"), Stats):
+                inst["stats"] = Stats.from_dict(inst.get("stats"))
+            for day_stat in inst.get("days", {}).values():
+                if not isinstance(day_stat.get("stats"), Stats):
+                    day_stat["stats"] = Stats.from_dict(day_stat.get("stats"))
+
+    def _replay_journal(self) -> None:
+        """Apply journal entries written after the last snapshot."""
+        if not os.path.exists(self.journal_path):
+            return
+        try:
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self._apply(msgspec.json.decode(line))
+        except Exception:  # pragma: no cover - corrupt journal
+            logger.warning("Failed to replay stats journal %s", self.journal_path)
+
+    def _apply(self, op: dict) -> None:
+        kind = op.get("op")
+        if kind == "inc":
+            self._apply_increment(
+                op["name"],
+                op.get("forwarded", False),
+                op.get("used_word", False),
+                op.get("used_prompt", False),
+                op.get("day") or current_day(),
+                op.get("n", 1),
+            )
+        elif kind == "tokens":
+            self._apply_tokens(
+                op["name"],
+                op.get("input_tokens", 0),
+                op.get("output_tokens", 0),
+                op.get("tokens", 0),
+                op.get("day") or current_day(),
+            )
+        elif kind == "chats":
+            self._get_inst(op["name"])["chats"] = op.get("chats", [])
+        elif kind == "clear_chats":
+            self._by_name.get(op["name"], {}).pop("chats", None)
+
+    def _get_inst(self, name: str) -> dict:
+        inst = self._by_name.get(name)
+        if inst is not None:
+            inst.setdefault("stats", Stats())
+            inst.setdefault("tokens", 0)
+            inst.setdefault("input_tokens", 0)
+            inst.setdefault("output_tokens", 0)
+            return inst
         inst = {
             "name": name,
-            "stats": Stats().to_dict(),
+            "stats": Stats(),
             "days": {},
             "tokens": 0,
             "input_tokens": 0,
             "output_tokens": 0,
         }
         self.data.setdefault("instances", []).append(inst)
+        self._by_name[name] = inst
         return inst
 
+    def _apply_increment(
+        self,
+        name: str,
+        forwarded: bool,
+        used_word: bool,
+        used_prompt: bool,
+        day: str,
+        n: int = 1,
+    ) -> None:
+        inst = self._get_inst(name)
+        day_stat = inst["days"].setdefault(day, {"stats": Stats()})
+        scopes = (self.data["stats"], inst["stats"], day_stat["stats"])
+        if not forwarded:
+            # Fast path: most messages are not forwarded and only bump "total"
+            for scope in scopes:
+                scope.total += n
+            return
+        keys = ("total", "forwarded_total")
+        if used_word:
+            keys += ("forwarded_words",)
+        if used_prompt:
+            keys += ("forwarded_prompt",)
+        for scope in scopes:
+            for key in keys:
+                setattr(scope, key, getattr(scope, key) + n)
+
     def increment(
         self,
         name: str,
@@ -123,20 +241,23 @@ class StatsTracker:
         used_word: bool = False,
         used_prompt: bool = False,
     ) -> None:
-        inst = self._get_inst(name)
         day = current_day()
-        day_stat = inst["days"].setdefault(day, {"stats": Stats().to_dict()})
-        for scope in (self.data["stats"], inst["stats"], day_stat["stats"]):
-            scope["total"] = scope.get("total", 0) + 1
-            if forwarded:
-                scope["forwarded_total"] = scope.get("forwarded_total", 0) + 1
-                if used_word:
-                    scope["forwarded_words"] = scope.get("forwarded_words", 0) + 1
-                if used_prompt:
-                    scope["forwarded_prompt"] = scope.get("forwarded_prompt", 0) + 1
+        self._apply_increment(name, forwarded, used_word, used_prompt, day)
+        key = (name, day, forwarded, used_word, used_prompt)
+        op = self._pending_inc.get(key)
+        if op is not None:
+            op["n"] += 1
+        else:
+            self._pending_inc[key] = {
+                "op": "inc",
+                "name": name,
+                "forwarded": forwarded,
+                "used_word": used_word,
+                "used_prompt": used_prompt,
+                "day": day,
+                "n": 1,
+            }
         self.dirty = True
-        if time.monotonic() - self.last_flush >= self.flush_interval:
-            self.flush()
 
     def add_tokens(
         self,
@@ -156,47 +277,137 @@ class StatsTracker:
         delta_total = tot if tot is not None and tot > 0 else in_t + out_t
         if delta_total <= 0:
             return
-        inst = self._get_inst(name)
         day = current_day()
-        day_stat = inst["days"].setdefault(day, {"stats": Stats().to_dict()})
+        self._apply_tokens(name, in_t, out_t, delta_total, day)
+        key = (name, day)
+        op = self._pending_tok.get(key)
+        if op is not None:
+            op["input_tokens"] += in_t
+            op["output_tokens"] += out_t
+            op["tokens"] += delta_total
+        else:
+            self._pending_tok[key] = {
+                "op": "tokens",
+                "name": name,
+                "input_tokens": in_t,
+                "output_tokens": out_t,
+                "tokens": delta_total,
+                "day": day,
+            }
+        self.dirty = True
+
+    def _apply_tokens(
+        self, name: str, in_t: int, out_t: int, delta_total: int, day: str
+    ) -> None:
+        inst = self._get_inst(name)
+        day_stat = inst["days"].setdefault(day, {"stats": Stats()})
         for scope in (self.data["stats"], inst["stats"], day_stat["stats"]):
-            scope["input_tokens"] = scope.get("input_tokens", 0) + in_t
-            scope["output_tokens"] = scope.get("output_tokens", 0) + out_t
-            scope["tokens"] = scope.get("tokens", 0) + delta_total
+            scope.input_tokens += in_t
+            scope.output_tokens += out_t
+            scope.tokens += delta_total
         inst["input_tokens"] = inst.get("input_tokens", 0) + in_t
         inst["output_tokens"] = inst.get("output_tokens", 0) + out_t
         inst["tokens"] = inst.get("tokens", 0) + delta_total
-        self.dirty = True
-        if time.monotonic() - self.last_flush >= self.flush_interval:
-            self.flush()
 
     def set_folder_chats(self, name: str, chat_ids: list[int]) -> None:
         """Store normalized folder chat IDs for an instance (sibling of per-instance stats)."""
         inst = self._get_inst(name)
         inst["chats"] = chat_ids
+        self._pending.append({"op": "chats", "name": name, "chats": chat_ids})
         self.dirty = True
-        if time.monotonic() - self.last_flush >= self.flush_interval:
-            self.flush()
 
     def clear_folder_chats(self, name: str) -> None:
         """Remove folder chat list for an instance when it no longer uses folders."""
         for inst in self.data.get("instances", []):
             if inst.get("name") == name and inst.pop("chats", None) is not None:
+                self._pending.append({"op": "clear_chats", "name": name})
                 self.dirty = True
-                if time.monotonic() - self.last_flush >= self.flush_interval:
-                    self.flush()
                 break
 
+    def start_flusher(self) -> None:
+        """Start the periodic background flush task on the running loop.
+
+        Replaces the old per-message ``time.monotonic()`` check; counters only
+        mark the tracker dirty and this task persists them every
+        ``flush_interval`` seconds.
+        """
+        if self._flusher_task is not None and not self._flusher_task.done():
+            return
+        self._flusher_task = asyncio.get_running_loop().create_task(self._flusher())
+
+    async def _flusher(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
     def flush(self) -> None:
+        """Append pending counter deltas to the journal.
+
+        Writes only the deltas accumulated since the last flush instead of
+        rewriting the whole stats tree; every ``SNAPSHOT_EVERY`` flushes the
+        journal is compacted into a full snapshot.
+        """
         if not self.dirty:
             return
-        logger.debug("Flushing stats to %s", self.path)
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=4)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Flushing stats journal to %s", self.journal_path)
+        ops = (
+            self._pending
+            + list(self._pending_inc.values())
+            + list(self._pending_tok.values())
+        )
+        if ops:
+            lines = b"".join(msgspec.json.encode(op) + b"\n" for op in ops)
+            with open(self.journal_path, "ab") as f:
+                f.write(lines)
+            self._pending.clear()
+            self._pending_inc.clear()
+            self._pending_tok.clear()
+        self._journal_flushes += 1
+        if self._journal_flushes >= SNAPSHOT_EVERY:
+            self.save_snapshot()
         self.last_flush = time.monotonic()
         self.dirty = False
 
+    def save_snapshot(self, pretty: bool = False) -> None:
+        """Write the full stats tree and truncate the absorbed journal.
+
+        Compact JSON by default; pass ``pretty=True`` when a human needs
+        to read the file.
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Writing stats snapshot to %s", self.path)
+        payload = msgspec.json.encode(self.data)
+        if pretty:
+            payload = msgspec.json.format(payload, indent=2)
+        # Write to a sibling temp file and rename so a crash mid-write never
+        # leaves a torn stats.json (the loader would drop it as corrupt).
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, self.path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._pending.clear()
+        self._pending_inc.clear()
+        self._pending_tok.clear()
+        self._journal_flushes = 0
+        self.last_flush = time.monotonic()
+        self.dirty = False
+
+    def close(self) -> None:
+        """Persist everything on shutdown."""
+        if self.dirty or self._pending or self._pending_inc or self._pending_tok:
+            self.save_snapshot()
+
+
+@lru_cache(maxsize=1)
+def get_stats() -> StatsTracker:
+    """Return the process-wide tracker, created (and its file read) on first use.
 
-stats = StatsTracker(STATS_PATH)
-atexit.register(stats.flush)
+    Keeps the stats load off the import path for CLI entrypoints that
+    never touch stats.
+    """
+    tracker = StatsTracker(STATS_PATH)
+    atexit.register(tracker.close)
+    return tracker
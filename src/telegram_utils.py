@@ -1,16 +1,55 @@
 import asyncio
 import logging
 import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List, Sequence, Set
 
 from telethon import errors, functions, types
 from telethon.utils import get_peer_id, resolve_id
 
+# Bound once; saves a module-dict lookup per use on the per-message paths
+_PeerChannel = types.PeerChannel
+_PeerChat = types.PeerChat
+_PeerUser = types.PeerUser
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - C extension may be unavailable
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+
+class _LRUCache(OrderedDict):
+    """Dict bounded to ``maxsize`` entries, evicting least-recently-used.
+
+    Keeps the long-running process from accumulating every entity it has
+    ever resolved.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
 client = None
-entity_name_cache: dict = {}
-entity_cache: dict = {}
+entity_name_cache: dict = _LRUCache()
+entity_cache: dict = _LRUCache()
+# Single-flight locks so concurrent misses on one key issue one RPC
+_entity_locks: dict = {}
 
 MUTE_FOREVER = 2**31 - 1
 
@@ -45,53 +84,135 @@ def _format_chat_for_log(chat, *, chat_id=None, chat_title: str | None = None) -
     return str(chat)
 
 
+# Compiled once; get_safe_name runs for every cached entity name
+_UNSAFE_RE = re.compile(r"[^\w\-_.]")
+# ASCII fast path: translate through a precomputed table instead of the
+# regex engine; non-ASCII names still need \w's unicode semantics
+_UNSAFE_TBL = {i: "_" for i in range(128) if not (chr(i).isalnum() or chr(i) in "_-.")}
+
+
+@lru_cache(maxsize=2048)
 def get_safe_name(name: str) -> str:
     """Return ``name`` with unsafe characters replaced by underscores."""
-    safe = re.sub(r"[^\w\-_.]", "_", name.strip())
+    name = name.strip()
+    if name.isascii():
+        safe = name.translate(_UNSAFE_TBL)
+    else:
+        safe = _UNSAFE_RE.sub("_", name)
     return safe or "chat_history"
 
 
+@lru_cache(maxsize=256)
+def prepare_words(words: tuple) -> tuple:
+    """Return lowercased ``words``, cached per word tuple.
+
+    Word lists come from config and rarely change, so lowering them once
+    beats re-lowering every word on every message.
+    """
+    return tuple(w.lower() for w in words)
+
+
+@lru_cache(maxsize=256)
+def _word_automaton(lowered: tuple):
+    """Build an Aho-Corasick automaton for the lowered word tuple.
+
+    One automaton pass over the text replaces a substring search per
+    word, so matching stays O(len(text)) however long the word list is.
+    """
+    automaton = ahocorasick.Automaton()
+    for word in lowered:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
 def word_in_text(words: List[str], text: str) -> bool:
     """Return True if any of the words is found in text."""
+    if not words:
+        return False
+    lowered = prepare_words(tuple(words))
     text_lower = text.lower()
-    return any(word.lower() in text_lower for word in words)
+    if ahocorasick is not None and all(lowered):
+        for _ in _word_automaton(lowered).iter(text_lower):
+            return True
+        return False
+    return any(word in text_lower for word in lowered)
 
 
 def find_word(words: List[str], text: str) -> str | None:
     """Return the first matching word found in text."""
+    if not words:
+        return None
+    lowered = prepare_words(tuple(words))
     text_lower = text.lower()
-    for word in words:
-        if word.lower() in text_lower:
+    if ahocorasick is not None and all(lowered):
+        found = {value for _, value in _word_automaton(lowered).iter(text_lower)}
+        if not found:
+            return None
+        for word, low in zip(words, lowered):
+            if low in found:
+                return word
+        return None
+    for word, low in zip(words, lowered):
+        if low in text_lower:
             return word
     return None
 
 
 async def get_entity(ident):
-    """Return Telegram entity using in-memory cache."""
+    """Return Telegram entity using in-memory cache.
+
+    Concurrent resolves of the same cold key wait on one lock instead of
+    each issuing a duplicate ``client.get_entity`` RPC.
+    """
     key = str(ident)
     if key in entity_cache:
         return entity_cache[key]
-    ent = await client.get_entity(ident)
-    entity_cache[key] = ent
-    return ent
+    lock = _entity_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            if key in entity_cache:
+                return entity_cache[key]
+            ent = await client.get_entity(ident)
+            entity_cache[key] = ent
+            return ent
+    finally:
+        _entity_locks.pop(key, None)
+
+
+# Title index for the folders list last seen by get_folder; turns K
+# lookups over the same list into one O(F) build plus K dict gets
+_folder_index: tuple[list, dict] | None = None
 
 
 async def get_folder(folders, folder_name):
-    target = None
+    global _folder_index
+
+    if _folder_index is None or _folder_index[0] is not folders:
+        index: dict = {}
+        for f in folders:
+            title = getattr(f, "title", "")
+            if hasattr(title, "text"):
+                title = title.text
+            # first folder wins on duplicate titles, as before
+            index.setdefault(title, f)
+        _folder_index = (folders, index)
+
+    return _folder_index[1].get(folder_name)
 
-    for f in folders:
-        title = getattr(f, "title", "")
-        if hasattr(title, "text"):
-            title = title.text
-        if title == folder_name:
-            target = f
-            break
 
-    return target
+# Folders rarely change mid-run; memoize briefly so back-to-back calls
+# during startup share one GetDialogFiltersRequest RPC
+_FOLDERS_TTL = 30.0
+_folders_cache: tuple[float, list | None] = (0.0, None)
 
 
 async def list_folders():
-    global client
+    global client, _folders_cache
+
+    ts, cached = _folders_cache
+    if cached is not None and time.monotonic() - ts < _FOLDERS_TTL:
+        return cached
 
     if not client or not client.is_connected():
         await client.connect()
@@ -105,6 +226,7 @@ async def list_folders():
         ):
             folders.append(f)
 
+    _folders_cache = (time.monotonic(), folders)
     return folders
 
 
@@ -129,46 +251,34 @@ def _sender_full_name(message) -> str:
 async def get_message_source(message):
     """Return message source with chat type, name, and optional URL."""
     url = get_message_url(message)
+    # One attribute walk up front; this runs for every forwarded message
     peer = message.peer_id
+    sender = getattr(message, "sender", None)
+    peer_type = type(peer)
 
-    if isinstance(peer, types.PeerChannel):
-        chat_type = "channel"
-    elif isinstance(peer, types.PeerChat):
-        chat_type = "group"
-    else:
-        chat_type = "private"
-
-    name = await get_chat_name(peer)
-
-    if chat_type == "private":
-        username = getattr(getattr(message, "sender", None), "username", None)
-        if username:
-            name = f"@{username}"
-    else:
+    # Resolve the chat name only when a username doesn't already win;
+    # saves the entity lookup on username-bearing messages
+    if peer_type is _PeerChannel or peer_type is _PeerChat:
         chat_username = getattr(getattr(message, "chat", None), "username", None)
-        if chat_username:
-            name = f"@{chat_username}"
-
-    if chat_type == "private":
-        username = getattr(getattr(message, "sender", None), "username", None)
-        full_name = _sender_full_name(message)
-        if username:
-            base_name = f"{chat_type} @{username}"
-            if full_name:
-                base_name = f"{base_name}, Name: {full_name}"
-        elif full_name:
-            base_name = f"{chat_type} Name: {full_name}"
-        else:
-            base_name = f"{chat_type} {name}"
+        base_name = f"@{chat_username}" if chat_username else await get_chat_name(peer)
+        if url:
+            return f"Forwarded from: [{base_name}]({url})"
+        return f"Forwarded from: {base_name}"
+
+    username = getattr(sender, "username", None)
+    full_name = _sender_full_name(message)
+    if username:
+        base_name = f"private @{username}"
+        if full_name:
+            base_name = f"{base_name}, Name: {full_name}"
+    elif full_name:
+        base_name = f"private Name: {full_name}"
     else:
-        base_name = name
+        base_name = f"private {await get_chat_name(peer)}"
 
-    if url and chat_type != "private":
-        result = f"Forwarded from: [{base_name}]({url})"
-    else:
-        result = f"Forwarded from: {base_name}"
-        if url:
-            result += f" - {url}"
+    result = f"Forwarded from: {base_name}"
+    if url:
+        result += f" - {url}"
     return result
 
 
@@ -221,12 +331,18 @@ async def get_chat_name(chat_identifier: str, safe: bool = False) -> str:
     if not chat_identifier:
         return "chat_history"
 
-    if (
-        safe
-        and isinstance(chat_identifier, (int, str))
-        and chat_identifier in entity_name_cache
-    ):
-        return entity_name_cache[chat_identifier]
+    # Normalize Peer* objects to their peer ID so event peers hit the
+    # name cache instead of re-resolving on every message
+    if isinstance(chat_identifier, (int, str)):
+        cache_key = chat_identifier
+    else:
+        try:
+            cache_key = get_peer_id(chat_identifier)
+        except Exception:  # pylint: disable=broad-except
+            cache_key = None
+
+    if safe and cache_key is not None and cache_key in entity_name_cache:
+        return entity_name_cache[cache_key]
 
     try:
         entity = await get_entity(chat_identifier)
@@ -253,8 +369,8 @@ async def get_chat_name(chat_identifier: str, safe: bool = False) -> str:
         safe_name = get_safe_name(name)
 
         if safe:
-            if isinstance(chat_identifier, (int, str)):
-                entity_name_cache[chat_identifier] = safe_name
+            if cache_key is not None:
+                entity_name_cache[cache_key] = safe_name
             return safe_name
 
         return name.strip() or "chat_history"
@@ -270,8 +386,8 @@ async def get_chat_name(chat_identifier: str, safe: bool = False) -> str:
 
         safe_name = get_safe_name(chat)
         if safe:
-            if isinstance(chat_identifier, (int, str)):
-                entity_name_cache[chat_identifier] = safe_name
+            if cache_key is not None:
+                entity_name_cache[cache_key] = safe_name
             return safe_name
         return chat or "chat_history"
 
@@ -279,19 +395,35 @@ async def get_chat_name(chat_identifier: str, safe: bool = False) -> str:
 async def get_entity_name(peer_id, safe: bool = False) -> str:
     """Return name for the given ``peer_id``."""
     if isinstance(peer_id, int):
+        # get_chat_name caches under get_peer_id(peer), which round-trips
+        # back to the raw signed ID, so hits skip the Peer* allocation
+        if safe and peer_id in entity_name_cache:
+            return entity_name_cache[peer_id]
         pid, cls = resolve_id(peer_id)
-        if cls == types.PeerChannel:
-            peer = types.PeerChannel(pid)
-        elif cls == types.PeerChat:
-            peer = types.PeerChat(pid)
+        if cls == _PeerChannel:
+            peer = _PeerChannel(pid)
+        elif cls == _PeerChat:
+            peer = _PeerChat(pid)
         else:
-            peer = types.PeerUser(pid)
+            peer = _PeerUser(pid)
     else:
         peer = peer_id
 
     return await get_chat_name(peer, safe=safe)
 
 
+# Exact-type fast paths for the peer classes seen in practice; skips
+# get_peer_id's internal type probing and the hasattr fallback chain
+_PEER_DISPATCH = {
+    _PeerUser: lambda p: p.user_id,
+    types.InputPeerUser: lambda p: p.user_id,
+    _PeerChannel: get_peer_id,
+    types.InputPeerChannel: get_peer_id,
+    _PeerChat: get_peer_id,
+    types.InputPeerChat: get_peer_id,
+}
+
+
 async def to_event_chat_id(peer) -> int | None:
     """Convert various peer representations to ``event.chat_id`` format."""
     if peer is None:
@@ -307,24 +439,30 @@ async def to_event_chat_id(peer) -> int | None:
             logger.error("Failed to resolve peer %s: %s", peer, exc)
             return -peer
 
+    handler = _PEER_DISPATCH.get(type(peer))
+    if handler is not None:
+        return handler(peer)
+
     try:
         return get_peer_id(peer)
     except Exception:
         if hasattr(peer, "channel_id"):
-            return get_peer_id(types.PeerChannel(peer.channel_id))
+            return get_peer_id(_PeerChannel(peer.channel_id))
         if hasattr(peer, "chat_id"):
-            return get_peer_id(types.PeerChat(peer.chat_id))
+            return get_peer_id(_PeerChat(peer.chat_id))
         if hasattr(peer, "user_id"):
             return peer.user_id
     return None
 
 
 async def normalize_chat_ids(ids: Set[int]) -> Set[int]:
-    """Normalize a set of chat IDs to ``event.chat_id`` format."""
-    result = set()
-    for cid in ids:
-        result.add(await to_event_chat_id(cid))
-    return {i for i in result if i is not None}
+    """Normalize a set of chat IDs to ``event.chat_id`` format.
+
+    IDs resolve concurrently so K unresolved peers cost ~one round trip
+    instead of K.
+    """
+    results = await asyncio.gather(*(to_event_chat_id(cid) for cid in ids))
+    return {i for i in results if i is not None}
 
 
 async def get_folders_chat_ids(config_folders):
@@ -339,10 +477,10 @@ async def get_folders_chat_ids(config_folders):
         if not folder:
             continue
 
-        for dialog in folder.include_peers:
-            chat_id = await to_event_chat_id(dialog)
-            if chat_id is not None:
-                chat_ids.add(chat_id)
+        resolved = await asyncio.gather(
+            *(to_event_chat_id(dialog) for dialog in folder.include_peers)
+        )
+        chat_ids.update(i for i in resolved if i is not None)
 
     return chat_ids
 
@@ -437,18 +575,65 @@ async def add_topic_from_folders(
     if not folder_names or not topics:
         return []
 
+    # Cap concurrency so parallel topic setup doesn't trip flood waits
+    sem = asyncio.Semaphore(8)
+
+    async def _get_channel(peer):
+        try:
+            return await client.get_entity(peer)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("Failed to get entity for peer %s: %s", peer, exc)
+            return None
+
+    async def _process_topic(
+        channel, chat_id, chat_title, topic: FolderTopic
+    ) -> tuple[int | None, int | None, str] | None:
+        async with sem:
+            user_added = await _add_user_to_channel(channel, topic.username)
+            if not user_added:
+                return None
+            existing = await _get_forum_topic_by_name(channel, topic.name)
+            topic_created = False
+            target_topic = existing
+            if not existing:
+                created = await _create_forum_topic(channel, topic.name)
+                if not created:
+                    return None
+                topic_created = True
+                target_topic = created
+            if not topic_created:
+                return None
+            topic_id = getattr(target_topic, "id", None)
+            top_msg_id = getattr(target_topic, "top_message", None)
+            thread_id = top_msg_id if top_msg_id is not None else topic_id
+            if topic.message and thread_id is not None:
+                try:
+                    await asyncio.sleep(2)
+                    await client.send_message(
+                        channel,
+                        topic.message,
+                        reply_to=thread_id,
+                    )
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.error(
+                        "Failed to send message to topic '%s' in %s: %s",
+                        topic.name,
+                        _format_chat_for_log(
+                            channel, chat_id=chat_id, chat_title=chat_title
+                        ),
+                        exc,
+                    )
+            return (chat_id, thread_id, chat_title)
+
     added: List[tuple[int | None, int | None, str]] = []
     folders = await list_folders()
     for fname in folder_names:
         folder = await get_folder(folders, fname)
         if not folder:
             continue
-        for peer in getattr(folder, "include_peers", []) or []:
-            try:
-                channel = await client.get_entity(peer)
-            except Exception as exc:  # pylint: disable=broad-except
-                logger.error("Failed to get entity for peer %s: %s", peer, exc)
-                continue
+        peers = getattr(folder, "include_peers", []) or []
+        channels = await asyncio.gather(*(_get_channel(peer) for peer in peers))
+        for channel in channels:
             if not isinstance(channel, types.Channel) or not (
                 getattr(channel, "megagroup", False)
                 and getattr(channel, "forum", False)
@@ -456,66 +641,57 @@ async def add_topic_from_folders(
                 continue
             chat_id = getattr(channel, "id", None)
             chat_title = getattr(channel, "title", "") or ""
-            for topic in topics:
-                if not isinstance(topic, FolderTopic):
-                    continue
-                user_added = await _add_user_to_channel(channel, topic.username)
-                if not user_added:
-                    continue
-                existing = await _get_forum_topic_by_name(channel, topic.name)
-                topic_created = False
-                target_topic = existing
-                if not existing:
-                    created = await _create_forum_topic(channel, topic.name)
-                    if not created:
-                        continue
-                    topic_created = True
-                    target_topic = created
-                if not topic_created:
+            results = await asyncio.gather(
+                *(
+                    _process_topic(channel, chat_id, chat_title, topic)
+                    for topic in topics
+                    if isinstance(topic, FolderTopic)
+                )
+            )
+            for res in results:
+                if res is None:
                     continue
-                topic_id = getattr(target_topic, "id", None)
-                top_msg_id = getattr(target_topic, "top_message", None)
-                thread_id = top_msg_id if top_msg_id is not None else topic_id
-                if topic.message and thread_id is not None:
-                    try:
-                        await asyncio.sleep(2)
-                        await client.send_message(
-                            channel,
-                            topic.message,
-                            reply_to=thread_id,
-                        )
-                    except Exception as exc:  # pylint: disable=broad-except
-                        logger.error(
-                            "Failed to send message to topic '%s' in %s: %s",
-                            topic.name,
-                            _format_chat_for_log(
-                                channel, chat_id=chat_id, chat_title=chat_title
-                            ),
-                            exc,
-                        )
-                added.append((chat_id, thread_id, chat_title))
+                added.append(res)
                 logger.info(
                     "Added topic to chat %s thread %s (%s)",
-                    chat_id,
-                    thread_id,
-                    chat_title,
+                    res[0],
+                    res[1],
+                    res[2],
                 )
     return added
 
 
 async def resolve_entities(entities: List[str]) -> Set[int]:
     """Resolve Telegram links or usernames to chat IDs."""
-    resolved = set()
-    for ent in entities:
+
+    async def _resolve(ent) -> int | None:
         try:
             entity = await get_entity(ent)
-            resolved.add(get_peer_id(entity))
+            return get_peer_id(entity)
         except Exception as exc:  # pylint: disable=broad-except
             logger.error("Failed to resolve entity %s: %s", ent, exc)
-    return resolved
+            return None
+
+    results = await asyncio.gather(*(_resolve(ent) for ent in entities))
+    return {r for r in results if r is not None}
+
+
+# Peers this process already muted forever; skips the settings RPC pair
+# when folders overlap or mute runs twice in one session
+_muted_peers: set = set()
+
+
+def _mute_cache_key(notify_peer):
+    try:
+        return get_peer_id(getattr(notify_peer, "peer", notify_peer))
+    except Exception:  # pylint: disable=broad-except
+        return None
 
 
 async def mute_notify_peer(notify_peer) -> None:
+    cache_key = _mute_cache_key(notify_peer)
+    if cache_key is not None and cache_key in _muted_peers:
+        return
     try:
         settings = await client(functions.account.GetNotifySettingsRequest(notify_peer))
         mute_until = getattr(settings, "mute_until", None)
@@ -532,6 +708,8 @@ async def mute_notify_peer(notify_peer) -> None:
                 )
             )
             logger.info("Muted peer %s", notify_peer)
+        if cache_key is not None:
+            _muted_peers.add(cache_key)
     except Exception as exc:  # pylint: disable=broad-except
         logger.error("Failed to mute peer %s: %s", notify_peer, exc)
 
@@ -551,12 +729,27 @@ async def mute_chats_from_folders(folder_names: List[str]) -> None:
     if not folder_names:
         return
     folders = await list_folders()
+    # Dedup peers shared between folders so each is muted once
+    peers: dict = {}
     for fname in folder_names:
         folder = await get_folder(folders, fname)
         if not folder:
             continue
         for p in getattr(folder, "include_peers", []):
-            await mute_peer_and_topics(p)
+            try:
+                key = get_peer_id(p)
+            except Exception:  # pylint: disable=broad-except
+                key = repr(p)
+            peers.setdefault(key, p)
+
+    # Bounded concurrency to stay under Telegram flood limits
+    sem = asyncio.Semaphore(10)
+
+    async def _one(peer) -> None:
+        async with sem:
+            await mute_peer_and_topics(peer)
+
+    await asyncio.gather(*(_one(p) for p in peers.values()))
 
 
 async def _is_participant(channel, username: str) -> bool:
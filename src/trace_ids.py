@@ -1,59 +1,186 @@
+import asyncio
 import atexit
-import json
 import logging
 import os
 import time
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 TRACE_IDS_PATH = os.path.join("data", "trace_ids.json")
 
 
+def _key(value: int | str) -> int | str:
+    """Return the canonical dict key for an ID.
+
+    IDs stay ints in memory (no per-message str() allocation); JSON turns
+    keys into strings only at the serialization boundary.
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
 class TraceStore:
-    """Store mapping from Telegram chat/message IDs to Langfuse trace IDs."""
+    """Store mapping from Telegram chat/message IDs to Langfuse trace IDs.
+
+    Writes are append-only: each ``set`` adds one JSONL line to a journal
+    next to the snapshot, so persisting a new trace costs one small write
+    instead of re-serializing the whole tree. The journal is replayed on
+    startup and compacted into a full snapshot once it outgrows the live
+    set.
+    """
 
     def __init__(self, path: str, flush_interval: int = 60) -> None:
         self.path = path
+        self.journal_path = path + ".log"
         self.flush_interval = flush_interval
         self.last_flush = time.monotonic()
         self.dirty = False
-        self.data: dict[str, dict[str, str]] = {}
+        self._journal_file = None
+        self._journal_entries = 0
+        self.data: dict[int | str, dict[int | str, str]] = {}
         if os.path.exists(path):
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    loaded = json.load(f)
+                with open(path, "rb") as f:
+                    loaded = orjson.loads(f.read())
                 if loaded and all(isinstance(v, str) for v in loaded.values()):
                     # backward compatibility with old format without chat ids
-                    self.data["0"] = loaded  # type: ignore[assignment]
-                else:
-                    self.data = loaded
+                    loaded = {"0": loaded}
+                self.data = {
+                    _key(chat): {_key(msg): tid for msg, tid in msgs.items()}
+                    for chat, msgs in loaded.items()
+                }
             except Exception:  # pragma: no cover - corrupt file
                 self.data = {}
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        """Apply journal lines written after the last snapshot."""
+        if not os.path.exists(self.journal_path):
+            return
+        try:
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = orjson.loads(line)
+                    self.data.setdefault(_key(entry["c"]), {})[_key(entry["m"])] = (
+                        entry["t"]
+                    )
+                    self._journal_entries += 1
+        except Exception:  # pragma: no cover - corrupt journal
+            logger.warning("Failed to replay trace journal %s", self.journal_path)
+
+    def _live_entries(self) -> int:
+        return sum(len(chat) for chat in self.data.values())
 
     def set(
         self, chat_id: int | str, message_id: int | str, trace_id: str | None
     ) -> None:
         if trace_id is None:
             return
-        chat = self.data.setdefault(str(chat_id), {})
-        chat[str(message_id)] = trace_id
+        chat = self.data.setdefault(_key(chat_id), {})
+        chat[_key(message_id)] = trace_id
+        if self._journal_file is None:
+            parent = os.path.dirname(self.path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            self._journal_file = open(self.journal_path, "ab")
+        self._journal_file.write(
+            orjson.dumps({"c": _key(chat_id), "m": _key(message_id), "t": trace_id})
+            + b"\n"
+        )
+        self._journal_entries += 1
+        self.dirty = True
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def bulk_set(self, items) -> None:
+        """Store many ``(chat_id, message_id, trace_id)`` triples at once.
+
+        All journal lines go out in a single write instead of one write
+        per trace.
+        """
+        lines = []
+        for chat_id, message_id, trace_id in items:
+            if trace_id is None:
+                continue
+            chat = self.data.setdefault(_key(chat_id), {})
+            chat[_key(message_id)] = trace_id
+            lines.append(
+                orjson.dumps({"c": _key(chat_id), "m": _key(message_id), "t": trace_id})
+                + b"\n"
+            )
+        if not lines:
+            return
+        if self._journal_file is None:
+            parent = os.path.dirname(self.path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            self._journal_file = open(self.journal_path, "ab")
+        self._journal_file.write(b"".join(lines))
+        self._journal_entries += len(lines)
         self.dirty = True
         if time.monotonic() - self.last_flush >= self.flush_interval:
             self.flush()
 
     def get(self, chat_id: int | str, message_id: int | str) -> str | None:
-        return self.data.get(str(chat_id), {}).get(str(message_id))
+        return self.data.get(_key(chat_id), {}).get(_key(message_id))
 
     def flush(self) -> None:
+        """Persist pending writes, off the event loop when one is running."""
         if not self.dirty:
             return
-        logger.debug("Flushing trace ids to %s", self.path)
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=4)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush_sync()
+            return
+        # Don't stall message forwarding on disk I/O
+        loop.run_in_executor(None, self._flush_sync)
+
+    def _flush_sync(self) -> None:
+        if not self.dirty:
+            return
+        logger.debug("Flushing trace ids to %s", self.journal_path)
+        if self._journal_file is not None:
+            self._journal_file.flush()
+        if self._journal_entries > 2 * self._live_entries():
+            self.save_snapshot()
         self.last_flush = time.monotonic()
         self.dirty = False
 
+    def save_snapshot(self) -> None:
+        """Write the full mapping and truncate the absorbed journal."""
+        logger.debug("Writing trace snapshot to %s", self.path)
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(self.data, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp, self.path)
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_entries = 0
+        self.last_flush = time.monotonic()
+        self.dirty = False
+
+    def close(self) -> None:
+        """Persist everything on shutdown."""
+        if self.dirty:
+            self.save_snapshot()
+        elif self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
 
 trace_ids = TraceStore(TRACE_IDS_PATH)
-atexit.register(trace_ids.flush)
+atexit.register(trace_ids.close)
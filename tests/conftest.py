@@ -1,87 +1,199 @@
+import asyncio
 import sys
 from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
+from telethon import types
 
 # Ensure project root is on sys.path for module imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 
-@pytest.fixture
-def dummy_message_cls():
-    """Factory for creating simple dummy message objects."""
+@pytest.fixture(autouse=True)
+async def _cancel_background_tasks():
+    """Cancel tasks leaked onto the shared session loop.
+
+    ``app.main`` spawns the stats flusher and rescan loops; with one event
+    loop for the whole session they would outlive their test and spin under
+    another test's patched ``asyncio.sleep``.
+    """
+    yield
+    current = asyncio.current_task()
+    leftovers = [t for t in asyncio.all_tasks() if t is not current and not t.done()]
+    for task in leftovers:
+        task.cancel()
+    if leftovers:
+        await asyncio.gather(*leftovers, return_exceptions=True)
 
-    class DummyMessage:
-        def __init__(self, peer_id, msg_id: int = 123, text: str | None = None):
-            self.peer_id = peer_id
-            self.id = msg_id
-            self.raw_text = text
-            self.forwarded: list[int] = []
 
-        async def forward_to(self, target):
-            self.forwarded.append(target)
+@pytest.fixture(autouse=True)
+def _unbind_prompts_config():
+    """Undo prompts._bind_config so tests don't inherit stale bound values."""
+    import src.prompts as prompts_module
 
-    return DummyMessage
+    prompts_module._bound = False
+    yield
+    prompts_module._bound = False
 
 
-@pytest.fixture
-def dummy_tg_client():
-    """Minimal stand-in for :class:`TelegramClient`."""
+@pytest.fixture(autouse=True)
+def _reset_entity_caches():
+    """Start every test with empty entity, folder and mute caches."""
+    for mod_name in ("src.main", "src.telegram_utils"):
+        mod = sys.modules.get(mod_name)
+        if mod is None:
+            continue
+        for cache_name in ("entity_name_cache", "entity_cache"):
+            cache = getattr(mod, cache_name, None)
+            if cache is not None:
+                cache.clear()
+    tgu = sys.modules.get("src.telegram_utils")
+    if tgu is not None:
+        tgu._folders_cache = (0.0, None)
+        tgu._folder_index = None
+        tgu._muted_peers.clear()
+    yield
 
-    class DummyTG:
-        def __init__(self):
-            self.on_handler = None
-            self.sent = []
-            self.started = False
 
-        async def start(self):
-            self.started = True
+@pytest.fixture(autouse=True)
+def _clear_config_caches():
+    """Keep config/instance memoization from leaking between tests."""
+    import src.config as config_module
 
-        def on(self, event):  # noqa: D401 - same interface as telethon
-            def deco(func):
-                self.on_handler = func
-                return func
+    config_module.clear_caches()
+    yield
+    config_module.clear_caches()
 
-            return deco
 
-        async def send_message(self, *args, **kwargs):
-            self.sent.append((args, kwargs))
+# Dummy classes are defined once at module level so fixtures only hand out
+# the class (or a fresh instance) instead of re-executing the class body
+# for every test.
+class DummyMessage:
+    def __init__(self, peer_id, msg_id: int = 123, text: str | None = None):
+        self.peer_id = peer_id
+        self.id = msg_id
+        self.raw_text = text
+        self.forwarded: list[int] = []
 
-        async def run_until_disconnected(self):
-            return None
+    async def forward_to(self, target):
+        self.forwarded.append(target)
 
-    return DummyTG()
 
+class DummyTG:
+    def __init__(self):
+        self.on_handler = None
+        self.sent = []
+        self.started = False
 
-@pytest.fixture
-def dummy_client_for_list():
-    """Client used for ``list_folders`` tests."""
+    async def start(self):
+        self.started = True
+
+    def on(self, event):  # noqa: D401 - same interface as telethon
+        def deco(func):
+            self.on_handler = func
+            return func
+
+        return deco
+
+    async def send_message(self, *args, **kwargs):
+        self.sent.append((args, kwargs))
+
+    async def run_until_disconnected(self):
+        return None
+
+
+class DummyClientForList:
+    def __init__(self, filters):
+        self.connected = False
+        self.filters = filters
+        self.calls: list[str] = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def connect(self):
+        self.connected = True
+        self.calls.append("connect")
+
+    async def __call__(self, req):
+        self.calls.append("request")
+        return SimpleNamespace(filters=self.filters)
+
+
+class DummyFolder:
+    __slots__ = ("title", "include_peers")
+
+    def __init__(self, title):
+        self.title = title
+        self.include_peers = []
+
+
+class DummyPeer:
+    __slots__ = ("channel_id",)
+
+    def __init__(self, cid):
+        self.channel_id = cid
+
+
+class DummyFolderPeers(DummyFolder):
+    __slots__ = ()
 
-    class DummyClientForList:
-        def __init__(self, filters):
-            self.connected = False
-            self.filters = filters
-            self.calls: list[str] = []
+    def __init__(self, title, peers):
+        super().__init__(title)
+        self.include_peers = [DummyPeer(cid) for cid in peers]
 
-        def is_connected(self):
-            return self.connected
 
-        async def connect(self):
-            self.connected = True
-            self.calls.append("connect")
+@pytest.fixture(scope="session")
+def sample_cfg_file(tmp_path_factory):
+    """A tiny YAML config written once for the whole session."""
+    path = tmp_path_factory.mktemp("cfg") / "cfg.yml"
+    path.write_text("foo: 1")
+    return path
 
-        async def __call__(self, req):
-            self.calls.append("request")
-            return SimpleNamespace(filters=self.filters)
 
+class DummyEntityClient:
+    """Telegram client stub whose ``get_entity`` answers via a callable."""
+
+    __slots__ = ("_resolver", "calls")
+
+    def __init__(self, resolver, recorder=None):
+        self._resolver = resolver
+        self.calls = recorder if recorder is not None else []
+
+    async def get_entity(self, ident):
+        self.calls.append(ident)
+        res = self._resolver(ident)
+        if isinstance(res, BaseException):
+            raise res
+        return res
+
+
+@pytest.fixture(scope="session")
+def make_dummy_client():
+    return DummyEntityClient
+
+
+@pytest.fixture(scope="session")
+def dummy_message_cls():
+    """Factory for creating simple dummy message objects."""
+    return DummyMessage
+
+
+@pytest.fixture
+def dummy_tg_client():
+    """Minimal stand-in for :class:`TelegramClient`."""
+    return DummyTG()
+
+
+@pytest.fixture(scope="session")
+def dummy_client_for_list():
+    """Client used for ``list_folders`` tests."""
     return DummyClientForList
 
 
 @pytest.fixture
 def create_filter():
-    from telethon import types
-
     def _create_filter():
         return types.DialogFilter(
             id=1, title=None, pinned_peers=[], include_peers=[], exclude_peers=[]
@@ -90,30 +202,16 @@ def create_filter():
     return _create_filter
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dummy_folder_cls():
-    class DummyFolder:
-        def __init__(self, title):
-            self.title = title
-            self.include_peers = []
-
     return DummyFolder
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dummy_peer_cls():
-    class DummyPeer:
-        def __init__(self, cid):
-            self.channel_id = cid
-
     return DummyPeer
 
 
-@pytest.fixture
-def dummy_folder_peers_cls(dummy_folder_cls, dummy_peer_cls):
-    class DummyFolderPeers(dummy_folder_cls):
-        def __init__(self, title, peers):
-            super().__init__(title)
-            self.include_peers = [dummy_peer_cls(cid) for cid in peers]
-
+@pytest.fixture(scope="session")
+def dummy_folder_peers_cls():
     return DummyFolderPeers
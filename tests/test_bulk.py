@@ -32,7 +32,6 @@ def test_parse_args_folder_required():
         parse_args(["--mute"])
 
 
-@pytest.mark.asyncio
 async def test_add_user_to_folder_chats(monkeypatch, caplog):
     invited = []
 
@@ -74,7 +73,6 @@ async def test_add_user_to_folder_chats(monkeypatch, caplog):
     assert sum("Added" in r.message for r in caplog.records) == 2
 
 
-@pytest.mark.asyncio
 async def test_add_user_to_folder_chats_already_participant(monkeypatch, caplog):
     from telethon import errors, functions
 
@@ -117,7 +115,6 @@ async def test_add_user_to_folder_chats_already_participant(monkeypatch, caplog)
     assert sum("already a participant" in m for m in messages) == 1
 
 
-@pytest.mark.asyncio
 async def test_add_user_to_folder_chats_folder_not_found(monkeypatch, caplog):
     async def fake_list_folders():
         return []
@@ -131,7 +128,6 @@ async def test_add_user_to_folder_chats_folder_not_found(monkeypatch, caplog):
     assert any("not found" in record.message for record in caplog.records)
 
 
-@pytest.mark.asyncio
 async def test_add_user_to_folder_chats_empty_args():
     await tgu.add_user_to_folder_chats("", "@user")
     await tgu.add_user_to_folder_chats("folder", "")
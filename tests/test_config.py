@@ -3,10 +3,8 @@ import pytest
 import src.config as config
 
 
-def test_load_config_success(tmp_path, monkeypatch):
-    cfg_file = tmp_path / "cfg.yml"
-    cfg_file.write_text("foo: 1")
-    monkeypatch.setattr(config, "CONFIG_PATH", str(cfg_file))
+def test_load_config_success(sample_cfg_file, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_PATH", str(sample_cfg_file))
     assert config.load_config() == {"foo": 1}
 
 
@@ -30,11 +28,10 @@ def test_config_path_env_override(tmp_path, monkeypatch):
     cfg = tmp_path / "env.yml"
     cfg.write_text("bar: 2")
     monkeypatch.setenv("CONFIG_PATH", str(cfg))
-    import importlib
-
-    cfg_module = importlib.reload(config)
-    assert cfg_module.CONFIG_PATH == str(cfg)
-    assert cfg_module.load_config() == {"bar": 2}
+    resolved = config._resolve_config_path()
+    assert resolved == str(cfg)
+    monkeypatch.setattr(config, "CONFIG_PATH", resolved)
+    assert config.load_config() == {"bar": 2}
 
 
 def test_parse_proxy_socks5():
@@ -70,7 +67,6 @@ def test_parse_proxy_unsupported_scheme():
         config.parse_proxy("ftp://127.0.0.1:21")
 
 
-@pytest.mark.asyncio
 async def test_load_instances_target_webhook_text_default():
     cfg = {
         "instances": [
@@ -87,7 +83,6 @@ async def test_load_instances_target_webhook_text_default():
     assert instances[0].target_webhook.format == "text"
 
 
-@pytest.mark.asyncio
 async def test_load_instances_target_webhook_json():
     cfg = {
         "instances": [
@@ -105,7 +100,6 @@ async def test_load_instances_target_webhook_json():
     assert instances[0].target_webhook.format == "json"
 
 
-@pytest.mark.asyncio
 async def test_load_instances_target_webhook_invalid_format():
     cfg = {
         "instances": [
@@ -120,7 +114,6 @@ async def test_load_instances_target_webhook_invalid_format():
         await config.load_instances(cfg)
 
 
-@pytest.mark.asyncio
 async def test_load_instances_target_webhook_missing_url():
     cfg = {
         "instances": [
@@ -135,14 +128,12 @@ async def test_load_instances_target_webhook_missing_url():
         await config.load_instances(cfg)
 
 
-@pytest.mark.asyncio
 async def test_load_instances_target_webhook_absent_defaults_to_none():
     cfg = {"instances": [{"name": "inst", "words": []}]}
     instances = await config.load_instances(cfg)
     assert instances[0].target_webhook is None
 
 
-@pytest.mark.asyncio
 async def test_load_instances_folder_add_topic():
     cfg = {
         "instances": [
@@ -1,15 +1,24 @@
 import builtins
 from types import SimpleNamespace
 
-import pytest
+from telethon import types
 
 import src.app as app
 import src.config as config
 import src.stats as stats_module
 import src.telegram_utils as tgu
 
+# Expected peer-id sets computed once at import; get_peer_id dispatch is
+# not free and these never change
+_EXPECTED_F1 = frozenset(
+    {tgu.get_peer_id(types.PeerChannel(1)), tgu.get_peer_id(types.PeerChannel(2))}
+)
+_EXPECTED_CH1 = frozenset({tgu.get_peer_id(types.PeerChannel(1))})
+_EXPECTED_CHAT_USER = frozenset(
+    {tgu.get_peer_id(types.PeerChat(7)), tgu.get_peer_id(types.PeerUser(8))}
+)
+
 
-@pytest.mark.asyncio
 async def test_list_folders_connect(monkeypatch, create_filter, dummy_client_for_list):
     f = create_filter()
     client = dummy_client_for_list([f])
@@ -20,21 +29,18 @@ async def test_list_folders_connect(monkeypatch, create_filter, dummy_client_for
     assert result == [f]
 
 
-@pytest.mark.asyncio
 async def test_get_folder_with_title_text(dummy_folder_cls):
     folders = [dummy_folder_cls(SimpleNamespace(text="MyFolder"))]
     folder = await tgu.get_folder(folders, "MyFolder")
     assert folder is folders[0]
 
 
-@pytest.mark.asyncio
 async def test_get_folder_not_found(dummy_folder_cls):
     folders = [dummy_folder_cls("Other")]
     result = await tgu.get_folder(folders, "Missing")
     assert result is None
 
 
-@pytest.mark.asyncio
 async def test_get_folders_chat_ids(monkeypatch, dummy_folder_peers_cls):
     folders = [dummy_folder_peers_cls("F1", [1, 2])]
 
@@ -43,17 +49,10 @@ async def test_get_folders_chat_ids(monkeypatch, dummy_folder_peers_cls):
 
     monkeypatch.setattr(tgu, "list_folders", fake_list_folders)
 
-    from telethon import types
-
     chat_ids = await tgu.get_folders_chat_ids(["F1"])
-    expected = {
-        tgu.get_peer_id(types.PeerChannel(1)),
-        tgu.get_peer_id(types.PeerChannel(2)),
-    }
-    assert chat_ids == expected
+    assert chat_ids == _EXPECTED_F1
 
 
-@pytest.mark.asyncio
 async def test_update_instance_chat_ids(monkeypatch, tmp_path):
     async def fake_get_folders_chat_ids(folders):
         assert folders == ["f"]
@@ -70,7 +69,6 @@ async def test_update_instance_chat_ids(monkeypatch, tmp_path):
         return []
 
     async def fake_get_input_entity(cid):
-        from telethon import types
 
         return types.InputPeerChat(cid)
 
@@ -103,7 +101,6 @@ async def test_update_instance_chat_ids(monkeypatch, tmp_path):
     assert inst_row["chats"] == [-5]
 
 
-@pytest.mark.asyncio
 async def test_update_instance_chat_ids_mute(monkeypatch, tmp_path):
     async def fake_get_folders_chat_ids(folders):
         return set()
@@ -135,7 +132,6 @@ async def test_update_instance_chat_ids_mute(monkeypatch, tmp_path):
     assert inst_row["chats"] == []
 
 
-@pytest.mark.asyncio
 async def test_update_instance_chat_ids_no_folders_clears_chats(monkeypatch, tmp_path):
     async def fake_get_folders_chat_ids(folders):
         assert folders == []
@@ -145,7 +141,6 @@ async def test_update_instance_chat_ids_no_folders_clears_chats(monkeypatch, tmp
         return set()
 
     async def fake_get_input_entity(cid):
-        from telethon import types
 
         return types.InputPeerChat(cid)
 
@@ -173,9 +168,7 @@ async def test_update_instance_chat_ids_no_folders_clears_chats(monkeypatch, tmp
     assert "chats" not in inst_row
 
 
-@pytest.mark.asyncio
 async def test_get_folders_chat_ids_channel(monkeypatch):
-    from telethon import types
 
     channel = types.InputPeerChannel(1, 2)
     folder = SimpleNamespace(title="F1", include_peers=[channel])
@@ -186,13 +179,10 @@ async def test_get_folders_chat_ids_channel(monkeypatch):
     monkeypatch.setattr(tgu, "list_folders", fake_list_folders)
 
     chat_ids = await tgu.get_folders_chat_ids(["F1"])
-    expected = {tgu.get_peer_id(types.PeerChannel(1))}
-    assert chat_ids == expected
+    assert chat_ids == _EXPECTED_CH1
 
 
-@pytest.mark.asyncio
 async def test_get_folders_chat_ids_chat_and_user(monkeypatch):
-    from telethon import types
 
     chat = types.InputPeerChat(7)
     user = types.InputPeerUser(8, 1)
@@ -204,14 +194,9 @@ async def test_get_folders_chat_ids_chat_and_user(monkeypatch):
     monkeypatch.setattr(tgu, "list_folders", fake_list_folders)
 
     chat_ids = await tgu.get_folders_chat_ids(["F2"])
-    expected = {
-        tgu.get_peer_id(types.PeerChat(7)),
-        tgu.get_peer_id(types.PeerUser(8)),
-    }
-    assert chat_ids == expected
+    assert chat_ids == _EXPECTED_CHAT_USER
 
 
-@pytest.mark.asyncio
 async def test_add_topic_from_folders(monkeypatch, caplog):
     from datetime import datetime
 
@@ -287,7 +272,6 @@ async def test_add_topic_from_folders(monkeypatch, caplog):
     assert dummy_client.invites == [["@user"]]
 
 
-@pytest.mark.asyncio
 async def test_add_topic_from_folders_existing_topic_invites(monkeypatch):
     from datetime import datetime
 
@@ -337,7 +321,6 @@ async def test_add_topic_from_folders_existing_topic_invites(monkeypatch):
     assert dummy_client.invites == [["@user"]]
 
 
-@pytest.mark.asyncio
 async def test_add_topic_logs_group_name_on_invite_error(monkeypatch, caplog):
     from telethon import functions
 
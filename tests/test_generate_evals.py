@@ -1,14 +1,33 @@
-import json
 from pathlib import Path
 
-import pytest
-import yaml
+import orjson
 
 import src.generate_evals as ge
-from src.trace_ids import trace_ids
+from src.trace_ids import TraceStore
+
+# Static config written as-is; skips a yaml.dump per test run
+_CFG_YAML = """\
+api_id: 1
+api_hash: hash
+session: session
+instances:
+  - name: Inst
+    true_positive_entity: pos
+    false_positive_entity: neg
+    words: []
+    prompts:
+      - name: Prompt
+        prompt: prompt text
+        threshold: 3
+        config:
+          model: gpt-4.1
+          temperature: 0.2
+"""
 
 
 class DummyMessage:
+    __slots__ = ("id", "chat_id", "text", "message", "raw_text")
+
     def __init__(self, msg_id: int, text: str, chat_id: int):
         self.id = msg_id
         self.chat_id = chat_id
@@ -27,46 +46,43 @@ class DummyClient:
     async def disconnect(self):
         return None
 
-    async def iter_messages(self, entity):
-        for msg in self._messages.get(entity, []):
-            yield msg
+    def iter_messages(self, entity):
+        return _ListAIter(self._messages.get(entity, ()))
+
+
+class _ListAIter:
+    """Async iterator over a prebuilt list without generator machinery."""
+
+    __slots__ = ("_it",)
+
+    def __init__(self, items):
+        self._it = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration from None
 
 
-@pytest.mark.asyncio
 async def test_generate_evals(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
 
     cfg_path = tmp_path / "config.yml"
-
-    cfg = {
-        "api_id": 1,
-        "api_hash": "hash",
-        "session": "session",
-        "instances": [
-            {
-                "name": "Inst",
-                "true_positive_entity": "pos",
-                "false_positive_entity": "neg",
-                "words": [],
-                "prompts": [
-                    {
-                        "name": "Prompt",
-                        "prompt": "prompt text",
-                        "threshold": 3,
-                        "config": {"model": "gpt-4.1", "temperature": 0.2},
-                    }
-                ],
-            }
-        ],
-    }
-    cfg_path.write_text(yaml.dump(cfg), encoding="utf-8")
+    cfg_path.write_text(_CFG_YAML, encoding="utf-8")
 
     msgs = {
         "pos": [DummyMessage(1, "p1", 100), DummyMessage(2, "p2", 100)],
         "neg": [DummyMessage(3, "n1", 200)],
     }
-    for m in msgs["pos"] + msgs["neg"]:
-        trace_ids.set(m.chat_id, m.id, f"t{m.id}")
+    # A store of our own keeps the global one clean: its atexit snapshot
+    # would otherwise drop data/trace_ids.json into the repo root
+    store = TraceStore(str(tmp_path / "trace_ids.json"), flush_interval=0)
+    store.bulk_set((m.chat_id, m.id, f"t{m.id}") for m in msgs["pos"] + msgs["neg"])
+    monkeypatch.setattr(ge, "trace_ids", store)
     monkeypatch.setattr(ge, "TelegramClient", lambda *a, **k: DummyClient(msgs))
 
     await ge.generate_evals("suf", config_path=str(cfg_path))
@@ -74,17 +90,18 @@ async def test_generate_evals(tmp_path, monkeypatch):
     base = Path("data/evals/Inst_Prompt_suf")
     data = base / "messages.jsonl"
     assert data.exists()
-    lines = [json.loads(l) for l in data.read_text(encoding="utf-8").splitlines()]
+    lines = [orjson.loads(l) for l in data.read_bytes().splitlines()]
     assert lines == [
         {"input": "p1", "expected": {"is_match": True}, "trace_id": "t1"},
         {"input": "p2", "expected": {"is_match": True}, "trace_id": "t2"},
         {"input": "n1", "expected": {"is_match": False}, "trace_id": "t3"},
     ]
-    task = (base / "task.yml").read_text(encoding="utf-8")
-    assert "eval_name: Inst_Prompt" in task
-    assert "score >= 3" in task
-    readme = (base / "README.md").read_text(encoding="utf-8")
+    task = (base / "task.yml").read_bytes()
+    assert b"eval_name: Inst_Prompt" in task
+    assert b"score >= 3" in task
+    readme = (base / "README.md").read_bytes()
     assert (
-        'python -m src.run_openai_evals --instance "Inst" --prompt "Prompt" --suffix suf'
+        b'python -m src.run_openai_evals --instance "Inst" --prompt "Prompt" --suffix suf'
         in readme
     )
+    store.close()
@@ -1,9 +1,6 @@
-import asyncio
 import os
 from types import SimpleNamespace
 
-import pytest
-
 import src.langfuse_utils as lfu
 import src.prompts as prompts
 
@@ -24,6 +21,53 @@ class DummyLangfuse:
         return "tid"
 
 
+class _LfStub:
+    """Langfuse prompt-API stub with configurable get/create behaviour."""
+
+    def __init__(self, get_result=None, get_exc=None, create_version=None):
+        self._get_result = get_result
+        self._get_exc = get_exc
+        self._create_version = create_version
+        self.get_calls = []
+        self.create_calls = []
+
+    def get_prompt(self, name, **kwargs):
+        self.get_calls.append((name, kwargs))
+        if self._get_exc is not None:
+            raise self._get_exc
+        return self._get_result
+
+    def create_prompt(self, **kwargs):
+        if self._create_version is None:
+            # creation disabled: load_langfuse_prompt falls back to the
+            # fetched prompt, like a client without write access
+            raise RuntimeError("create disabled")
+        self.create_calls.append(kwargs)
+        return SimpleNamespace(prompt=kwargs["prompt"], version=self._create_version)
+
+
+def make_openai_stub(result_obj):
+    """Return an AsyncOpenAI stand-in plus the dict capturing create kwargs."""
+    recorded = {}
+
+    class DummyCompletions:
+        async def create(self, **kwargs):
+            recorded.update(kwargs)
+            return SimpleNamespace(
+                choices=[
+                    SimpleNamespace(
+                        message=SimpleNamespace(content=result_obj.model_dump_json())
+                    )
+                ]
+            )
+
+    class DummyClient:
+        def __init__(self, api_key=None, http_client=None):
+            self.chat = SimpleNamespace(completions=DummyCompletions())
+
+    return DummyClient, recorded
+
+
 def test_init_langfuse(monkeypatch):
     recorded = {}
 
@@ -48,28 +92,15 @@ def test_init_langfuse(monkeypatch):
     os.environ.pop("LANGFUSE_HOST", None)
 
 
-@pytest.mark.asyncio
 async def test_match_prompt_logs(monkeypatch):
     dummy = DummyLangfuse()
     monkeypatch.setattr(prompts, "langfuse", dummy)
-    prompts.config["openai_api_key"] = "k"
+    monkeypatch.setitem(prompts.config, "openai_api_key", "k")
 
     result_obj = prompts.EvaluateResult(score=4, reasoning="", quote="f")
 
-    recorded = {}
-
-    class DummyCompletions:
-        def parse(self, **kwargs):
-            recorded.update(kwargs)
-            return SimpleNamespace(
-                choices=[SimpleNamespace(message=SimpleNamespace(parsed=result_obj))]
-            )
-
-    class DummyClient:
-        def __init__(self, api_key=None, http_client=None):
-            self.chat = SimpleNamespace(completions=DummyCompletions())
-
-    monkeypatch.setattr(prompts.openai, "OpenAI", DummyClient)
+    client_cls, recorded = make_openai_stub(result_obj)
+    monkeypatch.setattr(prompts.openai, "AsyncOpenAI", client_cls)
 
     prompt = prompts.Prompt(name="p", prompt="p")
     res = await prompts.match_prompt(prompt, "text", "i", "c")
@@ -86,17 +117,9 @@ async def test_match_prompt_logs(monkeypatch):
     assert recorded["metadata"] == {"langfuse_tags": ["i", "c"]}
 
 
-@pytest.mark.asyncio
 async def test_load_langfuse_prompt(monkeypatch):
-    recorded = {}
-
-    class DummyClient:
-        def get_prompt(self, name, **kwargs):  # noqa: D401 - test stub
-            recorded["name"] = name
-            recorded["kwargs"] = kwargs
-            return SimpleNamespace(prompt="loaded", version=1)
-
-    monkeypatch.setattr(prompts, "langfuse", DummyClient())
+    stub = _LfStub(get_result=SimpleNamespace(prompt="loaded", version=1))
+    monkeypatch.setattr(prompts, "langfuse", stub)
 
     p = prompts.Prompt(langfuse_name="n", langfuse_label="prod")
     lf = await prompts.load_langfuse_prompt(p)
@@ -105,23 +128,12 @@ async def test_load_langfuse_prompt(monkeypatch):
     assert p.langfuse_version == 1
     assert p._lf_prompt is lf
     assert p._lf_prompt.prompt == "loaded"
-    assert recorded["name"] == "n"
-    assert recorded["kwargs"] == {"type": "text", "label": "prod"}
+    assert stub.get_calls == [("n", {"type": "text", "label": "prod"})]
 
 
-@pytest.mark.asyncio
 async def test_load_langfuse_prompt_create(monkeypatch):
-    recorded = {}
-
-    class DummyClient:
-        def get_prompt(self, *a, **k):  # noqa: D401 - test stub
-            raise Exception("404")
-
-        def create_prompt(self, **kwargs):  # noqa: D401 - test stub
-            recorded.update(kwargs)
-            return SimpleNamespace(prompt=kwargs["prompt"], version=2)
-
-    monkeypatch.setattr(prompts, "langfuse", DummyClient())
+    stub = _LfStub(get_exc=Exception("404"), create_version=2)
+    monkeypatch.setattr(prompts, "langfuse", stub)
 
     p = prompts.Prompt(
         langfuse_name="n",
@@ -133,25 +145,18 @@ async def test_load_langfuse_prompt_create(monkeypatch):
     assert p.prompt == "text"
     assert p.langfuse_version == 2
     assert p._lf_prompt is lf
+    recorded = stub.create_calls[0]
     assert recorded["name"] == "n"
     assert recorded["labels"] == ["prod"]
     assert recorded["type"] == "text"
     assert recorded["config"] == {"model": "gpt"}
 
 
-@pytest.mark.asyncio
 async def test_load_langfuse_prompt_new_version(monkeypatch):
-    calls = {}
-
-    class DummyClient:
-        def get_prompt(self, *a, **k):  # noqa: D401 - test stub
-            return SimpleNamespace(prompt="old", version=1)
-
-        def create_prompt(self, **kwargs):  # noqa: D401 - test stub
-            calls.update(kwargs)
-            return SimpleNamespace(prompt=kwargs["prompt"], version=3)
-
-    monkeypatch.setattr(prompts, "langfuse", DummyClient())
+    stub = _LfStub(
+        get_result=SimpleNamespace(prompt="old", version=1), create_version=3
+    )
+    monkeypatch.setattr(prompts, "langfuse", stub)
 
     p = prompts.Prompt(
         langfuse_name="n",
@@ -163,32 +168,21 @@ async def test_load_langfuse_prompt_new_version(monkeypatch):
     assert p.langfuse_version == 3
     assert p._lf_prompt is lf
     expected_text = prompts.build_prompt(prompts.Prompt(prompt="new"))
+    calls = stub.create_calls[0]
     assert calls["prompt"] == expected_text
     assert calls["name"] == "n"
     assert calls["labels"] == ["prod"]
 
 
-@pytest.mark.asyncio
 async def test_match_prompt_lf_config(monkeypatch):
     dummy = DummyLangfuse()
     monkeypatch.setattr(prompts, "langfuse", dummy)
-    prompts.config["openai_api_key"] = "k"
+    monkeypatch.setitem(prompts.config, "openai_api_key", "k")
 
     result_obj = prompts.EvaluateResult(score=3, reasoning="", quote="f")
-    recorded = {}
-
-    class DummyCompletions:
-        def parse(self, **kwargs):
-            recorded.update(kwargs)
-            return SimpleNamespace(
-                choices=[SimpleNamespace(message=SimpleNamespace(parsed=result_obj))]
-            )
-
-    class DummyClient:
-        def __init__(self, api_key=None, http_client=None):
-            self.chat = SimpleNamespace(completions=DummyCompletions())
 
-    monkeypatch.setattr(prompts.openai, "OpenAI", DummyClient)
+    client_cls, recorded = make_openai_stub(result_obj)
+    monkeypatch.setattr(prompts.openai, "AsyncOpenAI", client_cls)
 
     lf_prompt = SimpleNamespace(config={"temperature": 0.1})
     p = prompts.Prompt(name="p", prompt="p")
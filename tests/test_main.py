@@ -1,8 +1,5 @@
-import asyncio
 from types import SimpleNamespace
 
-import pytest
-
 import src.app as app
 import src.config as config_module
 import src.prompts as prompts
@@ -27,7 +24,6 @@ def test_get_message_url_peerchannel(dummy_message_cls):
     assert tgu.get_message_url(msg) == "https://t.me/c/7/123"
 
 
-@pytest.mark.asyncio
 async def test_get_message_source_url(monkeypatch, dummy_message_cls):
     peer = tgu.types.PeerChannel(8)
     msg = dummy_message_cls(peer)
@@ -41,7 +37,6 @@ async def test_get_message_source_url(monkeypatch, dummy_message_cls):
     assert res == "Forwarded from: [@chan](https://t.me/c/8/123)"
 
 
-@pytest.mark.asyncio
 async def test_get_message_source_text(monkeypatch, dummy_message_cls):
     peer = tgu.types.PeerChat(9)
     msg = dummy_message_cls(peer)
@@ -55,7 +50,6 @@ async def test_get_message_source_text(monkeypatch, dummy_message_cls):
     assert res == "Forwarded from: Group"
 
 
-@pytest.mark.asyncio
 async def test_get_message_source_private(monkeypatch, dummy_message_cls):
     peer = tgu.types.PeerUser(10)
     msg = dummy_message_cls(peer)
@@ -69,7 +63,6 @@ async def test_get_message_source_private(monkeypatch, dummy_message_cls):
     assert res == "Forwarded from: private @user, Name: First Last"
 
 
-@pytest.mark.asyncio
 async def test_get_message_source_private_username_only(monkeypatch, dummy_message_cls):
     peer = tgu.types.PeerUser(10)
     msg = dummy_message_cls(peer)
@@ -83,7 +76,6 @@ async def test_get_message_source_private_username_only(monkeypatch, dummy_messa
     assert res == "Forwarded from: private @user"
 
 
-@pytest.mark.asyncio
 async def test_get_message_source_private_name_only(monkeypatch, dummy_message_cls):
     peer = tgu.types.PeerUser(10)
     msg = dummy_message_cls(peer)
@@ -97,7 +89,7 @@ async def test_get_message_source_private_name_only(monkeypatch, dummy_message_c
     assert res == "Forwarded from: private Name: First Last"
 
 
-def test_load_instances_direct():
+async def test_load_instances_direct():
     config = {
         "instances": [
             {
@@ -112,7 +104,7 @@ def test_load_instances_direct():
             }
         ]
     }
-    instances = asyncio.run(config_module.load_instances(config))
+    instances = await config_module.load_instances(config)
     assert len(instances) == 1
     inst = instances[0]
     assert inst.name == "test"
@@ -129,7 +121,7 @@ def test_load_instances_direct():
     assert inst.target_entity == "@test"
 
 
-def test_load_instances_backward_compat():
+async def test_load_instances_backward_compat():
     config = {
         "folders": ["f"],
         "chat_ids": [1],
@@ -137,7 +129,7 @@ def test_load_instances_backward_compat():
         "words": ["w"],
         "target_chat": 2,
     }
-    instances = asyncio.run(config_module.load_instances(config))
+    instances = await config_module.load_instances(config)
     assert len(instances) == 1
     inst = instances[0]
     assert inst.folders == ["f"]
@@ -149,7 +141,7 @@ def test_load_instances_backward_compat():
     assert inst.target_entity is None
 
 
-def test_load_instances_folder_mute():
+async def test_load_instances_folder_mute():
     config = {
         "instances": [
             {
@@ -159,81 +151,146 @@ def test_load_instances_folder_mute():
             }
         ]
     }
-    instances = asyncio.run(config_module.load_instances(config))
+    instances = await config_module.load_instances(config)
     assert instances[0].folder_mute is True
 
 
-def test_load_instances_no_forward_message():
+async def test_load_instances_no_forward_message():
     config = {"instances": [{"name": "n", "words": [], "no_forward_message": True}]}
-    instances = asyncio.run(config_module.load_instances(config))
+    instances = await config_module.load_instances(config)
     assert instances[0].no_forward_message is True
 
 
-def test_load_instances_ignore_words():
+async def test_load_instances_ignore_words():
     config = {"instances": [{"name": "i", "words": [], "ignore_words": ["bad"]}]}
-    instances = asyncio.run(config_module.load_instances(config))
+    instances = await config_module.load_instances(config)
     assert instances[0].ignore_words == ["bad"]
 
 
-def test_load_instances_negative_words():
+async def test_load_instances_negative_words():
     config = {"instances": [{"name": "i", "words": [], "negative_words": ["bad"]}]}
-    instances = asyncio.run(config_module.load_instances(config))
+    instances = await config_module.load_instances(config)
     assert instances[0].negative_words == ["bad"]
 
 
-def test_load_instances_ignore_words_backward():
+async def test_load_instances_ignore_words_backward():
     config = {"words": [], "ignore_words": ["bad"]}
-    instances = asyncio.run(config_module.load_instances(config))
+    instances = await config_module.load_instances(config)
     assert instances[0].ignore_words == ["bad"]
 
 
-def test_load_instances_negative_words_backward():
+async def test_load_instances_negative_words_backward():
     config = {"words": [], "negative_words": ["bad"]}
-    instances = asyncio.run(config_module.load_instances(config))
+    instances = await config_module.load_instances(config)
     assert instances[0].negative_words == ["bad"]
 
 
-@pytest.mark.asyncio
+def test_build_prompt_caches_digest():
+    import base64
+    import hashlib
+
+    p = prompts.Prompt(prompt="hello")
+    compiled = prompts.build_prompt(p)
+    assert p._compiled_sha == hashlib.sha256(compiled.encode()).digest()
+    assert p._compiled_b64 == base64.b64encode(p._compiled_sha).decode()
+
+
+def _openai_stub(create_fn):
+    """Return an AsyncOpenAI replacement whose completions.create is create_fn."""
+    completions = SimpleNamespace(create=create_fn)
+    return lambda api_key=None, http_client=None: SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    )
+
+
 async def test_match_prompt(monkeypatch):
     calls = []
 
-    class DummyCompletions:
-        def parse(
-            self,
-            *,
-            model=None,
-            messages=None,
-            response_format=None,
-            response_model=None,
-            metadata=None,
-        ):  # noqa: D401 - test stub
-            prompt = messages[0]["content"].split("\n", 1)[0]
-            calls.append(prompt)
-            return SimpleNamespace(
-                choices=[
-                    SimpleNamespace(
-                        message=SimpleNamespace(
-                            parsed=SimpleNamespace(score=3, reasoning="", quote="")
-                        )
+    async def fake_create(*, messages=None, **kwargs):  # noqa: D401 - test stub
+        prompt = messages[0]["content"].split("\n", 1)[0]
+        calls.append(prompt)
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(
+                        content='{"score": 3, "reasoning": "", "quote": ""}'
                     )
-                ]
-            )
-
-    class DummyClient:
-        def __init__(self, api_key=None, http_client=None):  # noqa: D401 - test stub
-            self.chat = SimpleNamespace(completions=DummyCompletions())
+                )
+            ]
+        )
 
-    monkeypatch.setattr(prompts.openai, "OpenAI", DummyClient)
-    prompts.config["openai_api_key"] = "k"
+    monkeypatch.setattr(prompts.openai, "AsyncOpenAI", _openai_stub(fake_create))
+    monkeypatch.setitem(prompts.config, "openai_api_key", "k")
     prompt = prompts.Prompt(name="p1", prompt="p1", threshold=2)
     result = await prompts.match_prompt(prompt, "msg", "i", "c")
     assert result.score == 3
     assert calls == ["p1"]
 
 
-@pytest.mark.asyncio
+async def test_match_prompt_retries_rate_limit(monkeypatch):
+    import httpx
+    import tenacity
+
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after": "0"}, request=request)
+    rate_limit = prompts.RateLimitError("rate limited", response=response, body=None)
+    calls = []
+
+    async def fake_create(**kwargs):  # noqa: D401 - test stub
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise rate_limit
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(
+                        content='{"score": 4, "reasoning": "", "quote": ""}'
+                    )
+                )
+            ]
+        )
+
+    monkeypatch.setattr(prompts.openai, "AsyncOpenAI", _openai_stub(fake_create))
+    monkeypatch.setattr(prompts._call_openai.retry, "wait", tenacity.wait_none())
+    monkeypatch.setitem(prompts.config, "openai_api_key", "k")
+    prompt = prompts.Prompt(name="p1", prompt="p1", threshold=2)
+    result = await prompts.match_prompt(prompt, "msg")
+    assert result.score == 4
+    assert len(calls) == 2
+
+
+async def test_match_prompt_batch(monkeypatch):
+    sent = []
+
+    async def fake_create(*, messages=None, response_format=None, **kwargs):
+        sent.append((messages, response_format))
+        content = '{"results": [{"score": 5, "reasoning": "r1", "quote": "q1"}]}'
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+
+    monkeypatch.setattr(prompts.openai, "AsyncOpenAI", _openai_stub(fake_create))
+    monkeypatch.setitem(prompts.config, "openai_api_key", "k")
+    prompt = prompts.Prompt(name="p1", prompt="p1", threshold=2)
+    results = await prompts.match_prompt_batch(prompt, ["a", "b"])
+    assert len(sent) == 1
+    assert sent[0][1] == prompts._EVAL_LIST_SCHEMA
+    assert '"text": "a"' in sent[0][0][1]["content"]
+    assert results[0].score == 5
+    assert results[0].quote == "q1"
+    # model returned fewer items than inputs: padded with empty result
+    assert results[1].score == 0
+
+
+async def test_match_prompt_batch_no_api(monkeypatch):
+    monkeypatch.setitem(prompts.config, "openai_api_key", "")
+    prompt = prompts.Prompt(name="n", prompt="hello")
+    results = await prompts.match_prompt_batch(prompt, ["x", "y"])
+    assert [r.score for r in results] == [0, 0]
+
+
 async def test_match_prompt_no_api(monkeypatch):
-    prompts.config["openai_api_key"] = ""
+    monkeypatch.setitem(prompts.config, "openai_api_key", "")
     prompt = prompts.Prompt(name="n", prompt="hello")
     result = await prompts.match_prompt(prompt, "msg")
     assert result == prompts.MatchPromptResult(
@@ -255,7 +312,6 @@ def test_get_forward_reason_text_prompt():
     assert text == "n: 2/5 - `q`\n\nпояснение"
 
 
-@pytest.mark.asyncio
 async def test_get_forward_message_text(monkeypatch, dummy_message_cls):
     peer = tgu.types.PeerChannel(1)
     msg = dummy_message_cls(peer)
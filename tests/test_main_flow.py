@@ -16,7 +16,6 @@ class BreakLoop(Exception):
     pass
 
 
-@pytest.mark.asyncio
 async def test_rescan_loop(monkeypatch):
     sleep_calls = []
     load_calls = []
@@ -43,7 +42,6 @@ async def test_rescan_loop(monkeypatch):
     assert len(load_calls) == 1
 
 
-@pytest.mark.asyncio
 async def test_setup_logging(monkeypatch):
     recorded = {}
 
@@ -58,7 +56,6 @@ async def test_setup_logging(monkeypatch):
     assert tele_logger.level == logging.WARNING
 
 
-@pytest.mark.asyncio
 async def test_main_flow(monkeypatch, dummy_tg_client, dummy_message_cls, tmp_path):
     config = {"log_level": "info"}
     monkeypatch.setattr(app, "load_config", lambda: config)
@@ -109,6 +106,8 @@ async def test_main_flow(monkeypatch, dummy_tg_client, dummy_message_cls, tmp_pa
     assert msg.forwarded == [99, "name"]
     assert dummy_client.sent[0][0][0] == 99
     assert dummy_client.sent[1][0][0] == "name"
+    # counters persist via journal + snapshot; force a snapshot to read them
+    app.stats.save_snapshot()
     data = json.loads(stats_path.read_text())
     assert data["stats"]["total"] == 1
     assert data["stats"]["forwarded_total"] == 1
@@ -120,7 +119,6 @@ async def test_main_flow(monkeypatch, dummy_tg_client, dummy_message_cls, tmp_pa
     assert inst["stats"]["forwarded_words"] == 1
 
 
-@pytest.mark.asyncio
 async def test_process_message_prompt(monkeypatch, dummy_message_cls, tmp_path):
     sent = []
 
@@ -171,7 +169,6 @@ async def test_process_message_prompt(monkeypatch, dummy_message_cls, tmp_path):
     assert inst_data["stats"]["forwarded_prompt"] == 1
 
 
-@pytest.mark.asyncio
 async def test_process_message_target_webhook(monkeypatch, dummy_message_cls, tmp_path):
     sent = []
 
@@ -222,7 +219,6 @@ async def test_process_message_target_webhook(monkeypatch, dummy_message_cls, tm
     assert called[0][1] is msg
 
 
-@pytest.mark.asyncio
 async def test_process_message_no_forward_message(
     monkeypatch, dummy_message_cls, tmp_path
 ):
@@ -258,7 +254,6 @@ async def test_process_message_no_forward_message(
     assert msg.forwarded == [1]
 
 
-@pytest.mark.asyncio
 async def test_ignore_usernames(
     monkeypatch, dummy_tg_client, dummy_message_cls, tmp_path
 ):
@@ -311,7 +306,6 @@ async def test_ignore_usernames(
     assert app.stats.data["stats"]["total"] == 0
 
 
-@pytest.mark.asyncio
 async def test_ignore_usernames_override_empty(
     monkeypatch, dummy_tg_client, dummy_message_cls, tmp_path
 ):
@@ -372,7 +366,6 @@ async def test_ignore_usernames_override_empty(
     assert app.stats.data["stats"]["forwarded_total"] == 1
 
 
-@pytest.mark.asyncio
 async def test_ignore_usernames_override_replaces_global(
     monkeypatch, dummy_tg_client, dummy_message_cls, tmp_path
 ):
@@ -441,7 +434,6 @@ async def test_ignore_usernames_override_replaces_global(
     assert app.stats.data["stats"]["forwarded_total"] == 1
 
 
-@pytest.mark.asyncio
 async def test_ignore_user_ids(
     monkeypatch, dummy_tg_client, dummy_message_cls, tmp_path
 ):
@@ -494,7 +486,6 @@ async def test_ignore_user_ids(
     assert app.stats.data["stats"]["total"] == 0
 
 
-@pytest.mark.asyncio
 async def test_false_positive_reaction(monkeypatch, dummy_message_cls):
     msg = dummy_message_cls(SimpleNamespace(channel_id=77), msg_id=5, text="hi")
 
@@ -537,7 +528,6 @@ async def test_false_positive_reaction(monkeypatch, dummy_message_cls):
     assert msg.forwarded == ["fp"]
 
 
-@pytest.mark.asyncio
 async def test_negative_reaction_twice(monkeypatch, dummy_message_cls):
     msg = dummy_message_cls(SimpleNamespace(channel_id=77), msg_id=5, text="hi")
 
@@ -583,7 +573,6 @@ async def test_negative_reaction_twice(monkeypatch, dummy_message_cls):
     assert msg.forwarded == ["fp"]
 
 
-@pytest.mark.asyncio
 async def test_true_positive_reaction(monkeypatch, dummy_message_cls):
     msg = dummy_message_cls(SimpleNamespace(channel_id=77), msg_id=5, text="hi")
 
@@ -625,7 +614,6 @@ async def test_true_positive_reaction(monkeypatch, dummy_message_cls):
     assert msg.forwarded == ["tp"]
 
 
-@pytest.mark.asyncio
 async def test_positive_reaction_twice(monkeypatch, dummy_message_cls):
     msg = dummy_message_cls(SimpleNamespace(channel_id=77), msg_id=5, text="hi")
 
@@ -670,7 +658,6 @@ async def test_positive_reaction_twice(monkeypatch, dummy_message_cls):
     assert msg.forwarded == ["tp"]
 
 
-@pytest.mark.asyncio
 async def test_ignore_words(monkeypatch, dummy_tg_client, dummy_message_cls, tmp_path):
     config = {"log_level": "info"}
     monkeypatch.setattr(app, "load_config", lambda: config)
@@ -722,7 +709,6 @@ async def test_ignore_words(monkeypatch, dummy_tg_client, dummy_message_cls, tmp
     assert app.stats.data["stats"]["total"] == 0
 
 
-@pytest.mark.asyncio
 async def test_negative_words(
     monkeypatch, dummy_tg_client, dummy_message_cls, tmp_path
 ):
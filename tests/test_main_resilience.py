@@ -38,7 +38,6 @@ class FakeClient:
         return behaviour
 
 
-@pytest.mark.asyncio
 async def test_resilient_loop_restarts_on_unknown_constructor(monkeypatch):
     sleeps = []
 
@@ -59,7 +58,6 @@ async def test_resilient_loop_restarts_on_unknown_constructor(monkeypatch):
     assert client._updates_error is None
 
 
-@pytest.mark.asyncio
 async def test_resilient_loop_propagates_other_errors(monkeypatch):
     async def fake_sleep(seconds):
         return None
@@ -10,8 +10,10 @@ import src.prompts as prompts
 import src.run_deepeval as rd
 
 
-@pytest.mark.asyncio
 async def test_run_deepeval(tmp_path, monkeypatch):
+    # get_eval_path() is relative to the cwd; keep the dataset out of the repo
+    monkeypatch.chdir(tmp_path)
+
     cfg = {
         "instances": [
             {
@@ -36,17 +38,22 @@ async def test_run_deepeval(tmp_path, monkeypatch):
         for row in messages:
             fh.write(json.dumps(row, ensure_ascii=False) + "\n")
 
-    async def fake_match_prompt(prompt, text, inst_name=None, chat_name=None):
-        score = 3 if text == "good" else 1
-        return SimpleNamespace(
-            score=score,
-            reasoning=f"rsn {text}",
-            quote=f"qt {text}",
-            token_cost=1.0,
-            completion_time=2.0,
-        )
+    batches: list[list[str]] = []
+
+    async def fake_match_prompt_batch(prompt, texts, inst_name=None, chat_name=None):
+        batches.append(list(texts))
+        return [
+            SimpleNamespace(
+                score=3 if text == "good" else 1,
+                reasoning=f"rsn {text}",
+                quote=f"qt {text}",
+                token_cost=1.0,
+                completion_time=2.0,
+            )
+            for text in texts
+        ]
 
-    monkeypatch.setattr(prompts, "match_prompt", fake_match_prompt)
+    monkeypatch.setattr(prompts, "match_prompt_batch", fake_match_prompt_batch)
 
     created: list[SimpleNamespace] = []
 
@@ -73,6 +80,7 @@ async def test_run_deepeval(tmp_path, monkeypatch):
 
     acc = await rd.run_deepeval("Inst", "Prompt", "suf", config_path=str(cfg_path))
     assert acc == 1.0
+    assert batches == [["good", "bad"]]
     assert created[0].comments == "rsn good"
     assert created[0].context == ["qt good"]
     assert created[0].token_cost == 1.0
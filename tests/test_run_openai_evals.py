@@ -1,7 +1,6 @@
 import json
 from types import SimpleNamespace
 
-import pytest
 import yaml
 
 import src.evals as evals
@@ -12,8 +11,9 @@ class DummyFiles:
     def __init__(self):
         self.called = False
 
-    def create(self, file, purpose):  # noqa: D401
+    async def create(self, file, purpose):  # noqa: D401
         self.called = True
+        self.purpose = purpose
         return SimpleNamespace(id="file-1")
 
 
@@ -23,11 +23,11 @@ class DummyEvals:
         self.run_args = None
         self.runs = SimpleNamespace(create=self._runs_create)
 
-    def create(self, **kwargs):
+    async def create(self, **kwargs):
         self.created = kwargs
         return SimpleNamespace(id="eval-1")
 
-    def _runs_create(self, eval_id, **kwargs):
+    async def _runs_create(self, eval_id, **kwargs):
         self.run_args = (eval_id, kwargs)
         return SimpleNamespace(report_url="url")
 
@@ -38,7 +38,10 @@ class DummyClient:
         self.evals = DummyEvals()
 
 
-def test_run_openai_evals(tmp_path, monkeypatch):
+async def test_run_openai_evals(tmp_path, monkeypatch):
+    # get_eval_path() is relative to the cwd; keep the dataset out of the repo
+    monkeypatch.chdir(tmp_path)
+
     cfg = {
         "openai_api_key": "key",
         "instances": [
@@ -70,9 +73,11 @@ def test_run_openai_evals(tmp_path, monkeypatch):
         )
 
     dummy = DummyClient()
-    monkeypatch.setattr(roe, "OpenAI", lambda api_key=None: dummy)
+    monkeypatch.setattr(
+        roe, "AsyncOpenAI", lambda api_key=None, http_client=None: dummy
+    )
 
-    url = roe.run_openai_evals("Inst", "Prompt", "suf", config_path=str(cfg_path))
+    url = await roe.run_openai_evals("Inst", "Prompt", "suf", config_path=str(cfg_path))
     assert url == "url"
     assert dummy.evals.created["name"] == "Inst_Prompt"
     assert (
@@ -90,5 +95,6 @@ def test_run_openai_evals(tmp_path, monkeypatch):
     )
     tmpl = ds["input_messages"]["template"]
     assert tmpl[0]["role"] == "system"
-    assert "file_content" in ds["source"]["type"]
-    assert len(ds["source"]["content"]) == 1
+    assert dummy.files.called
+    assert dummy.files.purpose == "evals"
+    assert ds["source"] == {"type": "file_id", "id": "file-1"}
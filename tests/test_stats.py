@@ -1,3 +1,4 @@
+import asyncio
 import json
 
 import src.stats as stats_module
@@ -11,7 +12,7 @@ def test_stats_increment_and_flush(tmp_path):
     tracker.increment("b")
     tracker.add_tokens("a", 4, 6, total_tokens=10)
     tracker.add_tokens("b", 2, 3, total_tokens=5)
-    tracker.flush()
+    tracker.save_snapshot()
     data = json.loads(path.read_text())
     assert data["stats"]["total"] == 3
     assert data["stats"]["tokens"] == 15
@@ -47,6 +48,19 @@ def test_stats_increment_and_flush(tmp_path):
     assert inst_a["days"][day]["stats"]["output_tokens"] == 6
 
 
+async def test_background_flusher(tmp_path):
+    path = tmp_path / "stats.json"
+    tracker = stats_module.StatsTracker(str(path), flush_interval=0)
+    tracker.start_flusher()
+    try:
+        tracker.increment("a")
+        await asyncio.sleep(0.05)
+        assert (tmp_path / "stats.json.log").exists()
+        assert not tracker.dirty
+    finally:
+        tracker._flusher_task.cancel()
+
+
 def test_convert_old_format():
     old = {
         "total": 1,
@@ -72,13 +86,13 @@ def test_folder_chats_set_and_clear(tmp_path):
     path = tmp_path / "stats.json"
     tracker = stats_module.StatsTracker(str(path), flush_interval=0)
     tracker.set_folder_chats("a", [-200, -100])
-    tracker.flush()
+    tracker.save_snapshot()
     data = json.loads(path.read_text())
     inst_a = next(i for i in data["instances"] if i["name"] == "a")
     assert inst_a["chats"] == [-200, -100]
 
     tracker.clear_folder_chats("a")
-    tracker.flush()
+    tracker.save_snapshot()
     data = json.loads(path.read_text())
     inst_a = next(i for i in data["instances"] if i["name"] == "a")
     assert "chats" not in inst_a
@@ -89,3 +103,25 @@ def test_clear_folder_chats_unknown_instance(tmp_path):
     tracker = stats_module.StatsTracker(str(path), flush_interval=0)
     tracker.clear_folder_chats("nonexistent")
     assert tracker.data["instances"] == []
+
+
+def test_journal_replay(tmp_path):
+    path = tmp_path / "stats.json"
+    tracker = stats_module.StatsTracker(str(path), flush_interval=0)
+    tracker.increment("a", forwarded=True, used_word=True)
+    tracker.add_tokens("a", 4, 6, total_tokens=10)
+    tracker.flush()
+    assert (tmp_path / "stats.json.log").exists()
+    assert not path.exists()
+
+    restored = stats_module.StatsTracker(str(path), flush_interval=0)
+    assert restored.data["stats"]["total"] == 1
+    assert restored.data["stats"]["forwarded_total"] == 1
+    assert restored.data["stats"]["tokens"] == 10
+    inst = restored.data["instances"][0]
+    assert inst["name"] == "a"
+    assert inst["stats"]["forwarded_words"] == 1
+
+    restored.save_snapshot()
+    assert path.exists()
+    assert not (tmp_path / "stats.json.log").exists()
@@ -8,6 +8,42 @@ def test_trace_store(tmp_path):
     path = tmp_path / "trace_ids.json"
     store = TraceStore(str(path), flush_interval=0)
     store.set(1, 123, "abc")
-    assert json.loads(path.read_text(encoding="utf-8")) == {"1": {"123": "abc"}}
+    journal = tmp_path / "trace_ids.json.log"
+    assert json.loads(journal.read_text(encoding="utf-8").strip()) == {
+        "c": 1,
+        "m": 123,
+        "t": "abc",
+    }
+    store.flush()
+    store.close()
     new_store = TraceStore(str(path))
     assert new_store.get(1, 123) == "abc"
+    new_store.close()
+
+
+def test_trace_store_bulk_set(tmp_path):
+    path = tmp_path / "trace_ids.json"
+    store = TraceStore(str(path), flush_interval=0)
+    store.bulk_set([(1, 10, "a"), (1, 11, "b"), (2, 20, None)])
+    assert store.get(1, 10) == "a"
+    assert store.get(1, 11) == "b"
+    assert store.get(2, 20) is None
+    store.flush()
+    store.close()
+    new_store = TraceStore(str(path))
+    assert new_store.get(1, 11) == "b"
+    new_store.close()
+
+
+def test_trace_store_snapshot_compacts_journal(tmp_path):
+    path = tmp_path / "trace_ids.json"
+    store = TraceStore(str(path), flush_interval=0)
+    store.set(1, 123, "abc")
+    store.set(1, 124, "def")
+    store.save_snapshot()
+    assert not (tmp_path / "trace_ids.json.log").exists()
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "1": {"123": "abc", "124": "def"}
+    }
+    new_store = TraceStore(str(path))
+    assert new_store.get(1, 124) == "def"
@@ -3,7 +3,6 @@ from datetime import datetime, timezone
 from types import SimpleNamespace
 
 import httpx
-import pytest
 
 from src import webhook
 from src.config import TargetWebhook
@@ -59,7 +58,6 @@ def test_format_json_payload_handles_missing_sender():
     assert payload["from_name"] == ""
 
 
-@pytest.mark.asyncio
 async def test_send_webhook_text(monkeypatch):
     captured = {}
 
@@ -96,7 +94,6 @@ async def test_send_webhook_text(monkeypatch):
     assert captured["client_kwargs"]["timeout"] == webhook.REQUEST_TIMEOUT
 
 
-@pytest.mark.asyncio
 async def test_send_webhook_json(monkeypatch):
     captured = {}
 
@@ -131,7 +128,6 @@ async def test_send_webhook_json(monkeypatch):
     assert body["message_id"] == 42
 
 
-@pytest.mark.asyncio
 async def test_send_webhook_swallows_network_error(monkeypatch, caplog):
     class FakeClient:
         def __init__(self, *args, **kwargs):
@@ -156,7 +152,6 @@ async def test_send_webhook_swallows_network_error(monkeypatch, caplog):
     assert any("Webhook delivery" in rec.message for rec in caplog.records)
 
 
-@pytest.mark.asyncio
 async def test_send_webhook_resolves_lazy_sender(monkeypatch):
     captured = {}
 
@@ -199,7 +194,6 @@ async def test_send_webhook_resolves_lazy_sender(monkeypatch):
     )
 
 
-@pytest.mark.asyncio
 async def test_send_webhook_logs_non_2xx(monkeypatch, caplog):
     class FakeResponse:
         status_code = 500